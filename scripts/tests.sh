@@ -3,7 +3,7 @@
 set -euo pipefail
 IFS=$'\n\t'
 
-uv run python -m pytest tests/ zamp_public_workflow_sdk/ --cov=zamp_public_workflow_sdk --cov-report=xml --cov-report=term-missing
+uv run python -m pytest -n auto --dist loadfile tests/ zamp_public_workflow_sdk/ --cov=zamp_public_workflow_sdk --cov-report=xml --cov-report=term-missing
 git fetch origin main:refs/remotes/origin/main
 uv run diff-cover --version
 
@@ -4,9 +4,11 @@ Helper functions for Temporal History simulation strategy.
 These functions can be used by other modules that need to work with Temporal workflow history.
 """
 
+import asyncio
 from collections import defaultdict
 
 import structlog
+from temporalio import workflow
 
 from zamp_public_workflow_sdk.simulation.models.node_payload import NodePayload
 from zamp_public_workflow_sdk.simulation.models.node_payload_models import (
@@ -29,6 +31,9 @@ logger = structlog.get_logger(__name__)
 
 MAIN_WORKFLOW_IDENTIFIER = "main_workflow"  # Identifier for top-level workflow nodes
 
+# Patch ID gating concurrent decode_node_payload scheduling; histories recorded before it decode one node at a time
+CONCURRENT_DECODE_PATCH_ID = "concurrent-decode"
+
 
 async def fetch_temporal_history(
     node_ids: list[str],
@@ -314,17 +319,16 @@ def get_workflow_path_from_node(node_id: str, child_workflow_id: str) -> str:
         - node_id="activity#1", child_workflow_id="Parent#1" (not found)
           -> "Parent#1" (returns the child_workflow_id itself as fallback)
     """
-    parts = node_id.split(".")
-    try:
-        child_index = parts.index(child_workflow_id)
-        return ".".join(parts[: child_index + 1])
-    except ValueError:
+    # Match child_workflow_id as a whole "."-delimited segment, so "Child#1" is not found inside "Child#10"
+    segment_start = f".{node_id}.".find(f".{child_workflow_id}.")
+    if segment_start == -1:
         logger.error(
             "Child workflow ID not found in node path",
             node_id=node_id,
             child_workflow_id=child_workflow_id,
         )
         return child_workflow_id
+    return node_id[: segment_start + len(child_workflow_id)]
 
 
 def collect_nodes_per_workflow(node_ids: list[str]) -> dict[str, list[str]]:
@@ -338,22 +342,20 @@ def collect_nodes_per_workflow(node_ids: list[str]) -> dict[str, list[str]]:
     workflow_nodes = {}
 
     for node_id in node_ids:
-        parts = node_id.split(".")
+        # Walk the separators once; each prefix is a slice of node_id rather than a re-join of split parts
+        workflow_end = node_id.find(".")
 
         # For each level, collect what that workflow needs (with prefix)
-        for depth_level in range(1, len(parts)):
-            workflow_path = ".".join(parts[:depth_level])
-            node_with_prefix = ".".join(parts[: depth_level + 1])
+        while workflow_end != -1:
+            node_end = node_id.find(".", workflow_end + 1)
+            workflow_path = node_id[:workflow_end]
+            node_with_prefix = node_id if node_end == -1 else node_id[:node_end]
 
-            # Initialize workflow path if not seen before
-            if workflow_path not in workflow_nodes:
-                workflow_nodes[workflow_path] = []
-
-            # Skip if this node
-            if node_with_prefix in workflow_nodes[workflow_path]:
-                continue
+            nodes = workflow_nodes.setdefault(workflow_path, [])
+            if node_with_prefix not in nodes:
+                nodes.append(node_with_prefix)
 
-            workflow_nodes[workflow_path].append(node_with_prefix)
+            workflow_end = node_end
 
     return workflow_nodes
 
@@ -372,15 +374,9 @@ def group_nodes_by_parent_workflow(node_ids: list[str]) -> dict[str, list[str]]:
     node_groups = defaultdict(list)
 
     for node_id in node_ids:
-        parts = node_id.split(".")
-
-        if len(parts) == 1:
-            parent = MAIN_WORKFLOW_IDENTIFIER
-        else:
-            # Use full path up to (but not including) the last part
-            parent = ".".join(parts[:-1])
-
-        node_groups[parent].append(node_id)
+        # Full path up to (but not including) the last part; empty for top-level nodes
+        parent, _, _ = node_id.rpartition(".")
+        node_groups[parent or MAIN_WORKFLOW_IDENTIFIER].append(node_id)
 
     return node_groups
 
@@ -546,14 +542,16 @@ def find_main_workflow_node(child_payloads: dict[str, NodePayload], node_id: str
     Returns:
         The main workflow NodePayload or None if not found
     """
-    parts = node_id.split(".")
-    target_workflow_path = ".".join(parts[:-1]) if len(parts) > 1 else parts[0]
+    # Everything before the last "." is the workflow path; rpartition avoids splitting and re-joining
+    parent, separator, _ = node_id.rpartition(".")
+    target_workflow_path = parent if separator else node_id
 
     if target_workflow_path in child_payloads:
         return child_payloads[target_workflow_path]
 
+    target_prefix = target_workflow_path + "."
     for child_node_id, child_payload in child_payloads.items():
-        if child_node_id.startswith(target_workflow_path + "."):
+        if child_node_id.startswith(target_prefix):
             return child_payload
 
     return None
@@ -664,8 +662,7 @@ async def _decode_and_build_results(
     Returns:
         List of NodePayloadResult objects with decoded input/output
     """
-    node_payload_results: list[NodePayloadResult] = []
-
+    nodes_to_decode: list[tuple[str, NodePayloadType, NodePayload]] = []
     for node_id, payload_type in output_config.items():
         encoded_payload = encoded_node_payloads.get(node_id)
 
@@ -677,12 +674,25 @@ async def _decode_and_build_results(
             )
             continue
 
-        decoded_data = await _decode_node_payload(
-            node_id=node_id,
-            encoded_payload=encoded_payload,
-            payload_type=payload_type,
+        nodes_to_decode.append((node_id, payload_type, encoded_payload))
+
+    if workflow.patched(CONCURRENT_DECODE_PATCH_ID):
+        # Schedule every decode at once so the activities go out together instead of one round-trip per node
+        decoded_results = await asyncio.gather(
+            *(
+                _decode_node_payload(node_id=node_id, encoded_payload=encoded_payload, payload_type=payload_type)
+                for node_id, payload_type, encoded_payload in nodes_to_decode
+            )
         )
+    else:
+        # Runs started before the patch replay their decodes in the original sequential command order
+        decoded_results = [
+            await _decode_node_payload(node_id=node_id, encoded_payload=encoded_payload, payload_type=payload_type)
+            for node_id, payload_type, encoded_payload in nodes_to_decode
+        ]
 
+    node_payload_results: list[NodePayloadResult] = []
+    for (node_id, payload_type, _), decoded_data in zip(nodes_to_decode, decoded_results):
         if not decoded_data:
             logger.warning(
                 "Failed to decode payload for node",
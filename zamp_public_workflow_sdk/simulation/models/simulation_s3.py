@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from zamp_public_workflow_sdk.simulation.models.config import SimulationConfig
 from zamp_public_workflow_sdk.simulation.models.node_payload import NodePayload
 
@@ -44,5 +44,9 @@ class SimulationMemo(BaseModel):
     node_id_to_payload_map: dict[str, NodePayload] = Field(..., description="Mapping of node IDs to their payloads")
 
 
+# Serializes a SimulationMemo straight to JSON bytes, skipping the intermediate str that model_dump_json builds
+SIMULATION_MEMO_ADAPTER = TypeAdapter(SimulationMemo)
+
+
 class GetSimulationDataFromS3Output(BaseModel):
     simulation_memo: SimulationMemo = Field(..., description="Simulation memo data loaded from S3")
@@ -17,7 +17,10 @@ class NodeComparison(BaseModel):
     )
     outputs_match: bool | None = Field(
         default=None,
-        description="Whether outputs match (None if node is mocked or comparison skipped)",
+        description=(
+            "Whether outputs match. None means outputs were not compared: the comparison failed, or the node is "
+            "mocked and SimulationValidatorInput.compare_mocked_outputs was False"
+        ),
     )
     actual_input: Any = Field(
         default=None,
@@ -41,10 +44,15 @@ class NodeComparison(BaseModel):
     )
     output_difference: dict[str, Any] | None = Field(
         default=None,
-        description="Differences between outputs (only populated if outputs don't match)",
+        description="Differences between outputs (only populated if outputs were compared and don't match)",
     )
     error: str | None = Field(default=None, description="Error message if comparison failed")
 
+    @property
+    def matched(self) -> bool:
+        """Whether the comparison succeeded with matching inputs and no output mismatch (None means not compared)."""
+        return self.error is None and bool(self.inputs_match) and self.outputs_match is not False
+
 
 class SimulationValidatorInput(BaseModel):
     """Input for workflow simulation validation."""
@@ -66,6 +74,10 @@ class SimulationValidatorInput(BaseModel):
         description="Run ID of the golden workflow (original execution without mocking)",
     )
     simulation_config: SimulationConfig = Field(..., description="Simulation config used in the simulation workflow")
+    compare_mocked_outputs: bool = Field(
+        default=False,
+        description="Whether to also diff outputs of mocked nodes, which are served from the mock rather than executed",
+    )
 
 
 class SimulationValidatorOutput(BaseModel):
@@ -73,7 +85,10 @@ class SimulationValidatorOutput(BaseModel):
 
     total_nodes_compared: int = Field(..., description="Total number of nodes compared")
     mocked_nodes_count: int = Field(..., description="Number of nodes that were mocked (skipped from comparison)")
-    matching_nodes_count: int = Field(..., description="Number of non-mocked nodes with matching inputs")
+    matching_nodes_count: int = Field(
+        ...,
+        description="Number of nodes with matching inputs, and matching outputs where outputs were compared",
+    )
     mismatched_nodes_count: int = Field(..., description="Number of non-mocked nodes with mismatched inputs")
     mismatched_node_ids: list[str] | None = Field(default=None, description="List of node IDs that had mismatches")
     comparison_error_nodes_count: int = Field(..., description="Number of nodes where comparison failed with error")
@@ -87,4 +102,10 @@ class SimulationValidatorOutput(BaseModel):
         default=None, description="List of node IDs missing in golden workflow"
     )
     comparisons: list[NodeComparison] = Field(..., description="Detailed comparison results for each node")
-    validation_passed: bool = Field(..., description="Whether all non-mocked nodes have matching inputs")
+    validation_passed: bool = Field(
+        ...,
+        description=(
+            "Whether all nodes have matching inputs, and matching outputs where outputs were compared; mocked node "
+            "outputs are only compared when compare_mocked_outputs is True"
+        ),
+    )
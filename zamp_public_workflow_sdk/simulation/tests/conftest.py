@@ -0,0 +1,45 @@
+import asyncio
+from collections.abc import Callable, Hashable
+
+import pytest
+
+
+class ConcurrencyProbe:
+    """
+    Records when probed calls start and finish, and how many of them were in flight at once.
+
+    visit() yields to the event loop until every expected call has started, giving up after max_yields
+    iterations. Concurrently scheduled calls therefore overlap, while sequential calls still finish, so
+    tests assert on max_in_flight or events instead of waiting on a wall-clock timeout.
+    """
+
+    def __init__(self, expected_calls: int, max_yields: int = 50):
+        self.expected_calls = expected_calls
+        self.max_yields = max_yields
+        self.events: list[tuple[str, Hashable]] = []
+        self.max_in_flight = 0
+        self._started = 0
+        self._in_flight = 0
+
+    async def visit(self, key: Hashable) -> None:
+        """Record the start of a call, let the other expected calls start, then record its end."""
+        self.events.append(("start", key))
+        self._started += 1
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        for _ in range(self.max_yields):
+            if self._started >= self.expected_calls:
+                break
+            await asyncio.sleep(0)
+        self._in_flight -= 1
+        self.events.append(("end", key))
+
+    def sequential_events(self, keys) -> list[tuple[str, Hashable]]:
+        """The events visit() records when the calls for keys run one after another."""
+        return [(step, key) for key in keys for step in ("start", "end")]
+
+
+@pytest.fixture
+def concurrency_probe() -> Callable[..., ConcurrencyProbe]:
+    """Build a ConcurrencyProbe expecting the given number of calls."""
+    return ConcurrencyProbe
@@ -21,7 +21,6 @@ class TestActionsHubSimulationIntegration:
         # Clear simulation maps before each test
         ActionsHub._workflow_id_to_simulation_map.clear()
 
-    @pytest.mark.asyncio
     async def test_execute_child_workflow_with_simulation_skip(self):
         """Test execute_child_workflow skips simulation for specific workflows."""
 
@@ -60,7 +59,6 @@ class TestActionsHubSimulationIntegration:
                         assert result == "workflow_result"
                         mock_execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_execute_child_workflow_with_simulation_mock(self):
         """Test execute_child_workflow returns mock response when simulation is active."""
 
@@ -93,7 +91,6 @@ class TestActionsHubSimulationIntegration:
                     assert result == "simulated_result"
                     mock_simulation.get_simulation_response.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_execute_child_workflow_with_simulation_execute(self):
         """Test execute_child_workflow executes normally when simulation returns EXECUTE."""
 
@@ -141,7 +138,6 @@ class TestActionsHubSimulationIntegration:
                         assert result == "workflow_result"
                         mock_execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_execute_child_workflow_with_result_type_conversion(self):
         """Test execute_child_workflow with result type conversion."""
 
@@ -191,7 +187,6 @@ class TestActionsHubSimulationIntegration:
                         assert isinstance(result, dict)
                         assert result["value"] == "test"
 
-    @pytest.mark.asyncio
     async def test_start_child_workflow_with_simulation_skip(self):
         """Test start_child_workflow skips simulation for specific workflows."""
 
@@ -214,7 +209,6 @@ class TestActionsHubSimulationIntegration:
                     assert result == "workflow_result"
                     mock_start.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_start_child_workflow_with_simulation_mock(self):
         """Test start_child_workflow returns mock response when simulation is active."""
 
@@ -247,7 +241,6 @@ class TestActionsHubSimulationIntegration:
                     assert result == "simulated_result"
                     mock_simulation.get_simulation_response.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_execute_child_workflow_api_mode(self):
         """Test execute_child_workflow in API mode."""
 
@@ -269,7 +262,6 @@ class TestActionsHubSimulationIntegration:
                 assert result == "api_result"
                 mock_func.assert_called_once_with("arg1", "arg2")
 
-    @pytest.mark.asyncio
     async def test_execute_child_workflow_with_string_workflow_name(self):
         """Test execute_child_workflow with string workflow name."""
         # Mock workflow registry
@@ -292,7 +284,6 @@ class TestActionsHubSimulationIntegration:
                 assert result == "workflow_result"
                 mock_workflow_obj.func.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_execute_child_workflow_workflow_not_found(self):
         """Test execute_child_workflow when workflow is not found."""
         # Mock context
@@ -305,7 +296,6 @@ class TestActionsHubSimulationIntegration:
                 with pytest.raises(ValueError, match="Workflow 'NonExistentWorkflow' not found"):
                     await ActionsHub.execute_child_workflow("NonExistentWorkflow", "arg1", "arg2")
 
-    @pytest.mark.asyncio
     async def test_execute_child_workflow_workflow_function_not_available(self):
         """Test execute_child_workflow when workflow function is not available."""
         # Mock workflow registry
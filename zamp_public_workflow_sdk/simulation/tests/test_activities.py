@@ -24,7 +24,6 @@ from zamp_public_workflow_sdk.temporal.workflow_history.models.node_payload_data
 class TestReturnMockedResult:
     """Test cases for return_mocked_result activity."""
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_no_decoding_needed_raw_output(self):
         """Test return_mocked_result with raw output payload that doesn't need decoding."""
         input_params = MockedResultInput(
@@ -39,7 +38,6 @@ class TestReturnMockedResult:
         assert isinstance(result, MockedResultOutput)
         assert result.root == {"result": "raw_value"}
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_no_decoding_needed_no_encoding_metadata(self):
         """Test return_mocked_result with dict payload without encoding metadata."""
         input_params = MockedResultInput(
@@ -54,7 +52,6 @@ class TestReturnMockedResult:
         assert isinstance(result, MockedResultOutput)
         assert result.root == {"output": "value"}
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_no_decoding_needed_none_payloads(self):
         """Test return_mocked_result with None payloads."""
         input_params = MockedResultInput(
@@ -69,7 +66,6 @@ class TestReturnMockedResult:
         assert isinstance(result, MockedResultOutput)
         assert result.root is None
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_no_decoding_needed_non_dict_payload(self):
         """Test return_mocked_result with non-dict payload (string, list, etc.)."""
         input_params = MockedResultInput(
@@ -84,7 +80,6 @@ class TestReturnMockedResult:
         assert isinstance(result, MockedResultOutput)
         assert result.root == [1, 2, 3]
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_output_needs_decoding(self):
         """Test return_mocked_result when output payload needs decoding."""
         encoded_output = {
@@ -120,7 +115,6 @@ class TestReturnMockedResult:
             assert call_args[1]["execution_mode"] == ExecutionMode.API
             assert call_args[0][1].node_id == "test_node#1"
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_input_needs_decoding(self):
         """Test return_mocked_result when input payload needs decoding."""
         encoded_input = {
@@ -157,7 +151,6 @@ class TestReturnMockedResult:
             mock_execute.assert_called_once()
             assert mock_execute.call_args[1]["execution_mode"] == ExecutionMode.API
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_both_needs_decoding(self):
         """Test return_mocked_result when both input and output payloads need decoding."""
         encoded_input = {
@@ -194,7 +187,6 @@ class TestReturnMockedResult:
             mock_execute.assert_called_once()
             assert mock_execute.call_args[1]["execution_mode"] == ExecutionMode.API
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_decoding_failure(self):
         """Test return_mocked_result when decoding fails."""
         encoded_output = {
@@ -220,7 +212,6 @@ class TestReturnMockedResult:
 
             mock_execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_encoding_metadata_missing(self):
         """Test return_mocked_result when dict has metadata but no encoding field."""
         payload_with_metadata_no_encoding = {
@@ -241,7 +232,6 @@ class TestReturnMockedResult:
         assert isinstance(result, MockedResultOutput)
         assert result.root == payload_with_metadata_no_encoding
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_encoding_metadata_none(self):
         """Test return_mocked_result when encoding field is explicitly None."""
         payload_with_none_encoding = {
@@ -262,7 +252,6 @@ class TestReturnMockedResult:
         assert isinstance(result, MockedResultOutput)
         assert result.root == payload_with_none_encoding
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_empty_metadata_dict(self):
         """Test return_mocked_result when metadata is empty dict."""
         payload_with_empty_metadata = {
@@ -283,7 +272,6 @@ class TestReturnMockedResult:
         assert isinstance(result, MockedResultOutput)
         assert result.root == payload_with_empty_metadata
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_no_metadata_key(self):
         """Test return_mocked_result when dict has no metadata key."""
         payload_no_metadata = {
@@ -303,7 +291,6 @@ class TestReturnMockedResult:
         assert isinstance(result, MockedResultOutput)
         assert result.root == payload_no_metadata
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_with_action_name(self):
         """Test return_mocked_result with action_name provided."""
         input_params = MockedResultInput(
@@ -318,7 +305,6 @@ class TestReturnMockedResult:
         assert isinstance(result, MockedResultOutput)
         assert result.root == {"result": "value"}
 
-    @pytest.mark.asyncio
     async def test_return_mocked_result_without_action_name(self):
         """Test return_mocked_result without action_name."""
         input_params = MockedResultInput(
@@ -336,7 +322,6 @@ class TestReturnMockedResult:
 class TestGetSimulationDataFromS3:
     """Test cases for get_simulation_data_from_s3 activity."""
 
-    @pytest.mark.asyncio
     async def test_get_simulation_data_from_s3_success(self):
         """Test successful download and decoding of simulation data from S3."""
         # Create mock simulation data
@@ -376,7 +361,6 @@ class TestGetSimulationDataFromS3:
             assert call_args[1]["skip_simulation"] is True
             assert call_args[1]["return_type"] == DownloadFromS3Output
 
-    @pytest.mark.asyncio
     async def test_get_simulation_data_from_s3_download_failure(self):
         """Test handling of download failure from S3."""
         input_params = GetSimulationDataFromS3Input(
@@ -395,7 +379,6 @@ class TestGetSimulationDataFromS3:
 
             mock_execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_get_simulation_data_from_s3_decode_failure(self):
         """Test handling of decode failure."""
         # Create invalid base64 content
@@ -418,7 +401,6 @@ class TestGetSimulationDataFromS3:
 
             mock_execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_get_simulation_data_from_s3_invalid_json(self):
         """Test handling of invalid JSON data."""
         # Create invalid JSON content
@@ -2,6 +2,13 @@ import pytest
 from unittest.mock import MagicMock, patch
 
 
+@pytest.fixture(autouse=True)
+def concurrent_decode_patched():
+    """Answer workflow.patched outside a workflow event loop, as a run started after the concurrent-decode patch."""
+    with patch("zamp_public_workflow_sdk.simulation.helper.workflow.patched", return_value=True) as mock_patched:
+        yield mock_patched
+
+
 @pytest.fixture
 def mock_workflow_history():
     """Create a mock WorkflowHistory object."""
@@ -34,7 +41,6 @@ def mock_decoded_output():
 class TestBuildNodePayload:
     """Tests for build_node_payload function."""
 
-    @pytest.mark.asyncio
     async def test_build_node_payload_success(self, mock_workflow_history, mock_encoded_payload, mock_decoded_output):
         """Test successful building of node payload results."""
         from zamp_public_workflow_sdk.simulation.helper import build_node_payload
@@ -80,7 +86,6 @@ class TestBuildNodePayload:
                     assert result[0].node_id == "node1#1"
                     assert result[1].node_id == "node2#1"
 
-    @pytest.mark.asyncio
     async def test_build_node_payload_no_history(self):
         """Test when temporal history fetch fails."""
         from zamp_public_workflow_sdk.simulation.helper import build_node_payload
@@ -99,7 +104,6 @@ class TestBuildNodePayload:
                     output_config=output_config,
                 )
 
-    @pytest.mark.asyncio
     async def test_build_node_payload_empty_config(self, mock_workflow_history):
         """Test with empty output config."""
         from zamp_public_workflow_sdk.simulation.helper import build_node_payload
@@ -122,7 +126,6 @@ class TestBuildNodePayload:
 
                 assert result == []
 
-    @pytest.mark.asyncio
     async def test_build_node_payload_partial_failures(
         self, mock_workflow_history, mock_encoded_payload, mock_decoded_output
     ):
@@ -166,7 +169,6 @@ class TestBuildNodePayload:
 class TestDecodeAndBuildResults:
     """Tests for _decode_and_build_results function."""
 
-    @pytest.mark.asyncio
     async def test_decode_and_build_results_success(self, mock_encoded_payload, mock_decoded_output):
         """Test successful decoding and building of results."""
         from zamp_public_workflow_sdk.simulation.helper import _decode_and_build_results
@@ -195,7 +197,6 @@ class TestDecodeAndBuildResults:
             assert mock_decode.call_count == 2
             assert all(isinstance(r, NodePayloadResult) for r in result)
 
-    @pytest.mark.asyncio
     async def test_decode_and_build_results_input_only(self, mock_encoded_payload):
         """Test building results with INPUT payload type only."""
         from zamp_public_workflow_sdk.simulation.helper import _decode_and_build_results
@@ -223,7 +224,6 @@ class TestDecodeAndBuildResults:
             assert result[0].input == {"test": "input"}
             assert result[0].output is None
 
-    @pytest.mark.asyncio
     async def test_decode_and_build_results_output_only(self, mock_encoded_payload):
         """Test building results with OUTPUT payload type only."""
         from zamp_public_workflow_sdk.simulation.helper import _decode_and_build_results
@@ -251,7 +251,6 @@ class TestDecodeAndBuildResults:
             assert result[0].input is None
             assert result[0].output == {"test": "output"}
 
-    @pytest.mark.asyncio
     async def test_decode_and_build_results_input_output(self, mock_encoded_payload, mock_decoded_output):
         """Test building results with INPUT_OUTPUT payload type."""
         from zamp_public_workflow_sdk.simulation.helper import _decode_and_build_results
@@ -275,7 +274,6 @@ class TestDecodeAndBuildResults:
             assert result[0].input == {"test": "input"}
             assert result[0].output == {"test": "output"}
 
-    @pytest.mark.asyncio
     async def test_decode_and_build_results_missing_payload(
         self,
     ):
@@ -295,7 +293,6 @@ class TestDecodeAndBuildResults:
         # Should skip missing nodes
         assert len(result) == 0
 
-    @pytest.mark.asyncio
     async def test_decode_and_build_results_decode_failure(self, mock_encoded_payload):
         """Test when decoding fails for a node."""
         from zamp_public_workflow_sdk.simulation.helper import _decode_and_build_results
@@ -317,11 +314,61 @@ class TestDecodeAndBuildResults:
             # Should skip failed decodes
             assert len(result) == 0
 
+    async def test_decode_and_build_results_schedules_all_decodes_concurrently(
+        self, mock_encoded_payload, concurrent_decode_patched, concurrency_probe
+    ):
+        """Test every decode is scheduled before any of them finishes, with results kept in output_config order."""
+        from zamp_public_workflow_sdk.simulation.helper import CONCURRENT_DECODE_PATCH_ID, _decode_and_build_results
+        from zamp_public_workflow_sdk.simulation.models.simulation_workflow import NodePayloadType
+
+        output_config = {f"node{i}#1": NodePayloadType.INPUT for i in range(3)}
+        probe = concurrency_probe(len(output_config))
+
+        async def decode(node_id, encoded_payload, payload_type):
+            await probe.visit(node_id)
+            return MagicMock(decoded_input={"node": node_id})
+
+        with patch("zamp_public_workflow_sdk.simulation.helper._decode_node_payload", side_effect=decode):
+            result = await _decode_and_build_results(
+                encoded_node_payloads=dict.fromkeys(output_config, mock_encoded_payload),
+                output_config=output_config,
+                workflow_id="wf-123",
+            )
+
+        assert probe.max_in_flight == len(output_config)
+        assert [r.node_id for r in result] == list(output_config)
+        assert [r.input for r in result] == [{"node": node_id} for node_id in output_config]
+        concurrent_decode_patched.assert_called_once_with(CONCURRENT_DECODE_PATCH_ID)
+
+    async def test_decode_and_build_results_unpatched_decodes_sequentially(
+        self, mock_encoded_payload, concurrent_decode_patched, concurrency_probe
+    ):
+        """Test runs started before the concurrent-decode patch finish each decode before scheduling the next."""
+        from zamp_public_workflow_sdk.simulation.helper import _decode_and_build_results
+        from zamp_public_workflow_sdk.simulation.models.simulation_workflow import NodePayloadType
+
+        concurrent_decode_patched.return_value = False
+        output_config = {f"node{i}#1": NodePayloadType.INPUT for i in range(3)}
+        probe = concurrency_probe(len(output_config))
+
+        async def decode(node_id, encoded_payload, payload_type):
+            await probe.visit(node_id)
+            return MagicMock(decoded_input={"node": node_id})
+
+        with patch("zamp_public_workflow_sdk.simulation.helper._decode_node_payload", side_effect=decode):
+            result = await _decode_and_build_results(
+                encoded_node_payloads=dict.fromkeys(output_config, mock_encoded_payload),
+                output_config=output_config,
+                workflow_id="wf-123",
+            )
+
+        assert probe.events == probe.sequential_events(output_config)
+        assert [r.node_id for r in result] == list(output_config)
+
 
 class TestDecodeNodePayload:
     """Tests for _decode_node_payload function."""
 
-    @pytest.mark.asyncio
     async def test_decode_node_payload_input(self, mock_encoded_payload):
         """Test decoding INPUT payload."""
         from zamp_public_workflow_sdk.simulation.helper import _decode_node_payload
@@ -352,7 +399,6 @@ class TestDecodeNodePayload:
             assert call_args.input_payload == "encoded_input_data"
             assert call_args.output_payload is None
 
-    @pytest.mark.asyncio
     async def test_decode_node_payload_output(self, mock_encoded_payload):
         """Test decoding OUTPUT payload."""
         from zamp_public_workflow_sdk.simulation.helper import _decode_node_payload
@@ -379,7 +425,6 @@ class TestDecodeNodePayload:
             assert call_args.input_payload is None
             assert call_args.output_payload == "encoded_output_data"
 
-    @pytest.mark.asyncio
     async def test_decode_node_payload_input_output(self, mock_encoded_payload):
         """Test decoding INPUT_OUTPUT payload."""
         from zamp_public_workflow_sdk.simulation.helper import _decode_node_payload
@@ -406,7 +451,6 @@ class TestDecodeNodePayload:
             assert call_args.input_payload == "encoded_input_data"
             assert call_args.output_payload == "encoded_output_data"
 
-    @pytest.mark.asyncio
     async def test_decode_node_payload_failure(self, mock_encoded_payload):
         """Test decoding failure."""
         from zamp_public_workflow_sdk.simulation.helper import _decode_node_payload
@@ -425,7 +469,6 @@ class TestDecodeNodePayload:
             # Should return None on failure
             assert result is None
 
-    @pytest.mark.asyncio
     async def test_decode_node_payload_activity_call(self, mock_encoded_payload):
         """Test that decode_node_payload activity is called correctly."""
         from zamp_public_workflow_sdk.simulation.helper import _decode_node_payload
@@ -1,5 +1,7 @@
 """Unit tests for SimulationConfigBuilderWorkflow."""
 
+import asyncio
+
 import pytest
 from unittest.mock import MagicMock, patch
 
@@ -18,9 +20,20 @@ from zamp_public_workflow_sdk.temporal.workflow_history.models import (
 from zamp_public_workflow_sdk.temporal.workflow_history.constants import EventType, EventField
 from zamp_public_workflow_sdk.simulation.workflows.simulation_config_builder_workflow import (
     SimulationConfigBuilderWorkflow,
+    _node_event_types,
 )
 
 
+@pytest.fixture(autouse=True)
+def concurrent_child_traversal_patched():
+    """Answer workflow.patched outside a workflow event loop, as a run started after the concurrent traversal patch."""
+    with patch(
+        "zamp_public_workflow_sdk.simulation.workflows.simulation_config_builder_workflow.workflow.patched",
+        return_value=True,
+    ) as mock_patched:
+        yield mock_patched
+
+
 class TestSimulationConfigBuilderWorkflow:
     """Test cases for SimulationConfigBuilderWorkflow."""
 
@@ -60,55 +73,53 @@ class TestSimulationConfigBuilderWorkflow:
         assert workflow.workflow_histories == {}
         assert "generate_llm_model_response" in workflow.nodes_to_skip
 
-    def test_is_child_workflow_node_with_child_workflow_events(self, workflow):
-        """Test _is_child_workflow_node returns True for child workflow events."""
-        # Mock node data with child workflow events
+    def test_node_event_types_collects_distinct_event_types(self):
+        """Test _node_event_types returns each event type of a node once."""
         node_data = MagicMock()
         node_data.node_events = [
-            {EventField.EVENT_TYPE.value: EventType.START_CHILD_WORKFLOW_EXECUTION_INITIATED.value},
-            {EventField.EVENT_TYPE.value: "some_other_event"},
+            {EventField.EVENT_TYPE.value: EventType.ACTIVITY_TASK_SCHEDULED.value},
+            {EventField.EVENT_TYPE.value: EventType.ACTIVITY_TASK_COMPLETED.value},
+            {EventField.EVENT_TYPE.value: EventType.ACTIVITY_TASK_SCHEDULED.value},
         ]
 
-        result = workflow._is_child_workflow_node(node_data)
+        assert _node_event_types(node_data) == {
+            EventType.ACTIVITY_TASK_SCHEDULED.value,
+            EventType.ACTIVITY_TASK_COMPLETED.value,
+        }
+
+    def test_is_child_workflow_node_with_child_workflow_events(self, workflow):
+        """Test _is_child_workflow_node returns True for child workflow events."""
+        event_types = {EventType.START_CHILD_WORKFLOW_EXECUTION_INITIATED.value, "some_other_event"}
+
+        result = workflow._is_child_workflow_node(event_types)
         assert result is True
 
     def test_is_child_workflow_node_with_child_workflow_started(self, workflow):
         """Test _is_child_workflow_node returns True for CHILD_WORKFLOW_EXECUTION_STARTED."""
-        node_data = MagicMock()
-        node_data.node_events = [
-            {EventField.EVENT_TYPE.value: EventType.CHILD_WORKFLOW_EXECUTION_STARTED.value},
-        ]
+        event_types = {EventType.CHILD_WORKFLOW_EXECUTION_STARTED.value}
 
-        result = workflow._is_child_workflow_node(node_data)
+        result = workflow._is_child_workflow_node(event_types)
         assert result is True
 
     def test_is_child_workflow_node_with_workflow_execution_started(self, workflow):
         """Test _is_child_workflow_node returns False for WORKFLOW_EXECUTION_STARTED."""
-        node_data = MagicMock()
-        node_data.node_events = [
-            {EventField.EVENT_TYPE.value: EventType.WORKFLOW_EXECUTION_STARTED.value},
-        ]
+        event_types = {EventType.WORKFLOW_EXECUTION_STARTED.value}
 
-        result = workflow._is_child_workflow_node(node_data)
+        result = workflow._is_child_workflow_node(event_types)
         assert result is False
 
     def test_is_child_workflow_node_without_child_workflow_events(self, workflow):
         """Test _is_child_workflow_node returns False for non-child workflow events."""
-        node_data = MagicMock()
-        node_data.node_events = [
-            {EventField.EVENT_TYPE.value: "ACTIVITY_TASK_SCHEDULED"},
-            {EventField.EVENT_TYPE.value: "WORKFLOW_TASK_COMPLETED"},
-        ]
+        event_types = {"ACTIVITY_TASK_SCHEDULED", "WORKFLOW_TASK_COMPLETED"}
 
-        result = workflow._is_child_workflow_node(node_data)
+        result = workflow._is_child_workflow_node(event_types)
         assert result is False
 
     def test_is_child_workflow_node_with_empty_events(self, workflow):
         """Test _is_child_workflow_node returns False for empty events."""
-        node_data = MagicMock()
-        node_data.node_events = []
+        event_types = set()
 
-        result = workflow._is_child_workflow_node(node_data)
+        result = workflow._is_child_workflow_node(event_types)
         assert result is False
 
     def test_should_include_node_includes_valid_node(self, workflow):
@@ -126,7 +137,22 @@ class TestSimulationConfigBuilderWorkflow:
         result = workflow._should_include_node("some_generate_llm_model_response_activity")
         assert result is None
 
-    @pytest.mark.asyncio
+    def test_should_include_node_treats_patterns_literally(self, workflow):
+        """Test _should_include_node matches skip patterns as plain substrings, not regexes."""
+        workflow.nodes_to_skip = ["fetch.data", "run(1)"]
+        workflow._compile_node_matchers()
+
+        assert workflow._should_include_node("fetchXdata#1") == "fetchXdata#1"
+        assert workflow._should_include_node("Child#1.fetch.data#1") is None
+        assert workflow._should_include_node("run(1)#1") is None
+
+    def test_should_include_node_with_no_patterns(self, workflow):
+        """Test _should_include_node includes every node when both pattern lists are empty."""
+        workflow.nodes_to_skip = []
+        workflow._compile_node_matchers()
+
+        assert workflow._should_include_node("generate_llm_model_response#1") == "generate_llm_model_response#1"
+
     async def test_process_child_workflow_node_all_activities_mocked(self, workflow):
         """Test _process_child_workflow_node returns parent node_id when all activities would be mocked."""
         # Mock workflow history
@@ -153,7 +179,40 @@ class TestSimulationConfigBuilderWorkflow:
                 assert result == ["parent_node"]
                 assert mock_should_include.call_count == 3
 
-    @pytest.mark.asyncio
+    def test_can_mock_as_single_node_stops_at_first_disqualifying_node(self, workflow):
+        """Test _can_mock_as_single_node returns False without checking nodes after a nested child workflow."""
+        nested_child_node = MagicMock(
+            node_events=[{EventField.EVENT_TYPE.value: EventType.START_CHILD_WORKFLOW_EXECUTION_INITIATED.value}]
+        )
+        nodes_data = {
+            "child_node1": MagicMock(node_events=[]),
+            "nested_child": nested_child_node,
+            "child_node2": MagicMock(node_events=[]),
+        }
+
+        with patch.object(workflow, "_should_include_node", side_effect=lambda node_id: node_id) as mock_should_include:
+            assert workflow._can_mock_as_single_node(nodes_data) is False
+
+        mock_should_include.assert_called_once_with(node_id="child_node1")
+
+    def test_can_mock_as_single_node_empty_child(self, workflow):
+        """Test _can_mock_as_single_node returns False for a child workflow without nodes."""
+        assert workflow._can_mock_as_single_node({}) is False
+
+    async def test_process_child_workflow_node_parses_child_nodes_once(self, workflow):
+        """Test a child history's nodes are parsed once across the single-node check and the extraction."""
+        workflow_history = MagicMock()
+        workflow_history.get_child_workflow_workflow_id_run_id.return_value = ("child-workflow-id", "child-run-id")
+        child_history = MagicMock(workflow_id="child-workflow-id", run_id="child-run-id")
+        child_history.get_nodes_data.return_value = {"generate_llm_model_response#1": MagicMock(node_events=[])}
+
+        with patch.object(workflow, "_execute_history_fetch", return_value=child_history):
+            result = await workflow._process_child_workflow_node("parent_node", workflow_history)
+
+        # The skipped activity forces extraction of individual activities from the same child history
+        assert result == []
+        child_history.get_nodes_data.assert_called_once_with()
+
     async def test_process_child_workflow_node_some_activities_skipped(self, workflow):
         """Test _process_child_workflow_node returns individual activities when some are skipped."""
         # Mock workflow history
@@ -185,7 +244,6 @@ class TestSimulationConfigBuilderWorkflow:
                 # _should_include_node is called 3 times in initial check + 3 times in recursive call = 6 total
                 assert mock_should_include.call_count == 6
 
-    @pytest.mark.asyncio
     async def test_process_child_workflow_node_exception(self, workflow):
         """Test _process_child_workflow_node raises exceptions."""
         workflow_history = MagicMock()
@@ -240,7 +298,6 @@ class TestSimulationConfigBuilderWorkflow:
         # Should return all nodes from the workflow history
         assert set(result) == {"activity1", "child_workflow"}
 
-    @pytest.mark.asyncio
     async def test_extract_all_node_ids_recursively_with_regular_nodes(self, workflow):
         """Test _extract_all_node_ids_recursively processes regular nodes."""
         # Mock workflow history with regular nodes
@@ -257,7 +314,6 @@ class TestSimulationConfigBuilderWorkflow:
 
             assert result == ["node1"]  # node2 should be filtered out
 
-    @pytest.mark.asyncio
     async def test_extract_all_node_ids_recursively_with_child_workflows(self, workflow):
         """Test _extract_all_node_ids_recursively processes child workflows."""
         # Mock workflow history with child workflow
@@ -280,7 +336,77 @@ class TestSimulationConfigBuilderWorkflow:
 
                 assert result == ["regular_node", "child_node1", "child_node2"]
 
-    @pytest.mark.asyncio
+    async def test_extract_all_node_ids_recursively_preserves_order_across_child_workflows(self, workflow):
+        """Test child workflow node IDs keep their history position when processed concurrently."""
+        child_events = [{EventField.EVENT_TYPE.value: EventType.START_CHILD_WORKFLOW_EXECUTION_INITIATED.value}]
+        workflow_history = MagicMock()
+        workflow_history.get_nodes_data.return_value = {
+            "childA": MagicMock(node_events=child_events),
+            "regular_node": MagicMock(node_events=[]),
+            "childB": MagicMock(node_events=child_events),
+        }
+
+        async def process_child(node_id, workflow_history):
+            return [f"{node_id}.activity1", f"{node_id}.activity2"]
+
+        with patch.object(workflow, "_should_include_node", side_effect=lambda node_id: node_id):
+            with patch.object(workflow, "_process_child_workflow_node", side_effect=process_child):
+                result = await workflow._extract_all_node_ids_recursively(workflow_history)
+
+        assert result == [
+            "childA.activity1",
+            "childA.activity2",
+            "regular_node",
+            "childB.activity1",
+            "childB.activity2",
+        ]
+
+    async def test_extract_all_node_ids_recursively_traverses_child_workflows_concurrently(
+        self, workflow, concurrency_probe
+    ):
+        """Test every child workflow starts processing before any of them finishes."""
+        child_events = [{EventField.EVENT_TYPE.value: EventType.START_CHILD_WORKFLOW_EXECUTION_INITIATED.value}]
+        workflow_history = MagicMock()
+        workflow_history.get_nodes_data.return_value = {
+            "childA": MagicMock(node_events=child_events),
+            "childB": MagicMock(node_events=child_events),
+        }
+        probe = concurrency_probe(2)
+
+        async def process_child(node_id, workflow_history):
+            await probe.visit(node_id)
+            return [f"{node_id}.activity1"]
+
+        with patch.object(workflow, "_process_child_workflow_node", side_effect=process_child):
+            result = await workflow._extract_all_node_ids_recursively(workflow_history)
+
+        assert probe.max_in_flight == 2
+        assert result == ["childA.activity1", "childB.activity1"]
+
+    async def test_extract_all_node_ids_recursively_unpatched_traverses_sequentially(
+        self, workflow, concurrent_child_traversal_patched, concurrency_probe
+    ):
+        """Test runs started before the traversal patch finish each child workflow before starting the next."""
+        concurrent_child_traversal_patched.return_value = False
+        child_events = [{EventField.EVENT_TYPE.value: EventType.START_CHILD_WORKFLOW_EXECUTION_INITIATED.value}]
+        workflow_history = MagicMock()
+        workflow_history.get_nodes_data.return_value = {
+            "childA": MagicMock(node_events=child_events),
+            "regular_node": MagicMock(node_events=[]),
+            "childB": MagicMock(node_events=child_events),
+        }
+        probe = concurrency_probe(2)
+
+        async def process_child(node_id, workflow_history):
+            await probe.visit(node_id)
+            return [f"{node_id}.activity1"]
+
+        with patch.object(workflow, "_process_child_workflow_node", side_effect=process_child):
+            result = await workflow._extract_all_node_ids_recursively(workflow_history)
+
+        assert probe.events == probe.sequential_events(["childA", "childB"])
+        assert result == ["childA.activity1", "regular_node", "childB.activity1"]
+
     async def test_fetch_workflow_history_success(self, workflow, mock_fetch_history_output):
         """Test _fetch_workflow_history fetches history successfully."""
         with patch(
@@ -292,7 +418,6 @@ class TestSimulationConfigBuilderWorkflow:
             assert result == mock_fetch_history_output
             mock_execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_fetch_workflow_history_exception(self, workflow):
         """Test _fetch_workflow_history raises exception on failure."""
         with patch(
@@ -302,6 +427,26 @@ class TestSimulationConfigBuilderWorkflow:
             with pytest.raises(Exception, match="Fetch failed"):
                 await workflow._fetch_workflow_history("test-workflow-id", "test-run-id")
 
+    async def test_fetch_workflow_history_reuses_cached_and_in_flight_fetches(
+        self, workflow, mock_fetch_history_output
+    ):
+        """Test _fetch_workflow_history fetches each (workflow_id, run_id) once, even when requested concurrently."""
+        with patch(
+            "zamp_public_workflow_sdk.simulation.workflows.simulation_config_builder_workflow.ActionsHub.execute_child_workflow",
+            return_value=mock_fetch_history_output,
+        ) as mock_execute:
+            concurrent_results = await asyncio.gather(
+                workflow._fetch_workflow_history("test-workflow-id", "test-run-id"),
+                workflow._fetch_workflow_history("test-workflow-id", "test-run-id"),
+            )
+            cached_result = await workflow._fetch_workflow_history("test-workflow-id", "test-run-id")
+
+            assert concurrent_results == [mock_fetch_history_output, mock_fetch_history_output]
+            assert cached_result == mock_fetch_history_output
+            mock_execute.assert_called_once()
+            assert workflow._history_cache == {("test-workflow-id", "test-run-id"): (mock_fetch_history_output, None)}
+            assert workflow.workflow_histories == {}
+
     def test_generate_simulation_config(self, workflow):
         """Test _generate_simulation_config creates proper configuration."""
         node_ids = ["node1", "node2", "node3"]
@@ -320,7 +465,12 @@ class TestSimulationConfigBuilderWorkflow:
         assert strategy.strategy.config.reference_workflow_id == workflow_id
         assert strategy.strategy.config.reference_workflow_run_id == run_id
 
-    @pytest.mark.asyncio
+    def test_generate_simulation_config_deduplicates_node_ids(self, workflow):
+        """Test _generate_simulation_config drops repeated node IDs while keeping their first position."""
+        result = workflow._generate_simulation_config(["node1", "node2", "node1", "node3", "node2"], "wf", "run")
+
+        assert result.mock_config.node_strategies[0].nodes == ["node1", "node2", "node3"]
+
     async def test_execute_full_workflow(self, workflow, sample_input):
         """Test complete execute workflow."""
         # Mock workflow history
@@ -341,8 +491,8 @@ class TestSimulationConfigBuilderWorkflow:
 
                 mock_fetch.assert_called_once_with(workflow_id=sample_input.workflow_id, run_id=sample_input.run_id)
                 mock_extract.assert_called_once_with(workflow_history=mock_history)
+                assert workflow.workflow_histories == {workflow.MAIN_WORKFLOW_KEY: mock_history}
 
-    @pytest.mark.asyncio
     async def test_execute_with_empty_nodes(self, workflow, sample_input):
         """Test execute workflow with no nodes."""
         mock_history = MagicMock()
@@ -354,7 +504,6 @@ class TestSimulationConfigBuilderWorkflow:
                 with pytest.raises(Exception):
                     await workflow.execute(sample_input)
 
-    @pytest.mark.asyncio
     async def test_execute_with_mixed_node_types(self, workflow, sample_input):
         """Test execute workflow with mixed regular and child workflow nodes."""
         mock_history = MagicMock()
@@ -388,34 +537,25 @@ class TestSimulationConfigBuilderWorkflow:
 
     def test_is_workflow_execution_node_with_workflow_execution_started(self, workflow):
         """Test _is_workflow_execution_node returns True for WORKFLOW_EXECUTION_STARTED."""
-        node_data = MagicMock()
-        node_data.node_events = [
-            {EventField.EVENT_TYPE.value: EventType.WORKFLOW_EXECUTION_STARTED.value},
-        ]
+        event_types = {EventType.WORKFLOW_EXECUTION_STARTED.value}
 
-        result = workflow._is_workflow_execution_node(node_data)
+        result = workflow._is_workflow_execution_node(event_types)
         assert result is True
 
     def test_is_workflow_execution_node_without_workflow_execution_started(self, workflow):
         """Test _is_workflow_execution_node returns False for non-workflow execution events."""
-        node_data = MagicMock()
-        node_data.node_events = [
-            {EventField.EVENT_TYPE.value: EventType.ACTIVITY_TASK_SCHEDULED.value},
-            {EventField.EVENT_TYPE.value: EventType.WORKFLOW_TASK_COMPLETED.value},
-        ]
+        event_types = {EventType.ACTIVITY_TASK_SCHEDULED.value, EventType.WORKFLOW_TASK_COMPLETED.value}
 
-        result = workflow._is_workflow_execution_node(node_data)
+        result = workflow._is_workflow_execution_node(event_types)
         assert result is False
 
     def test_is_workflow_execution_node_with_empty_events(self, workflow):
         """Test _is_workflow_execution_node returns False for empty events."""
-        node_data = MagicMock()
-        node_data.node_events = []
+        event_types = set()
 
-        result = workflow._is_workflow_execution_node(node_data)
+        result = workflow._is_workflow_execution_node(event_types)
         assert result is False
 
-    @pytest.mark.asyncio
     async def test_execute_with_execute_actions(self, workflow):
         """Test execute workflow with execute_actions parameter."""
         input_with_actions = SimulationConfigBuilderInput(
@@ -439,7 +579,9 @@ class TestSimulationConfigBuilderWorkflow:
                 assert "custom_action2" in workflow.nodes_to_skip
                 assert isinstance(result, SimulationConfigBuilderOutput)
 
-    @pytest.mark.asyncio
+        # The skip matcher is recompiled once the list is extended
+        assert workflow._should_include_node("custom_action1#1") is None
+
     async def test_process_child_workflow_node_with_workflow_execution_nodes(self, workflow):
         """Test _process_child_workflow_node skips workflow execution nodes."""
         workflow_history = MagicMock()
@@ -468,7 +610,6 @@ class TestSimulationConfigBuilderWorkflow:
                 # Should return parent node_id since all activities would be mocked (workflow execution node skipped)
                 assert result == ["parent_node"]
 
-    @pytest.mark.asyncio
     async def test_process_child_workflow_node_with_nested_child_workflows(self, workflow):
         """Test _process_child_workflow_node detects nested child workflows."""
         workflow_history = MagicMock()
@@ -500,7 +641,6 @@ class TestSimulationConfigBuilderWorkflow:
                     # Should return individual activities since there are nested child workflows
                     assert result == ["child_node1", "child_node2"]
 
-    @pytest.mark.asyncio
     async def test_extract_all_node_ids_recursively_with_workflow_execution_nodes(self, workflow):
         """Test _extract_all_node_ids_recursively skips workflow execution nodes."""
         workflow_history = MagicMock()
@@ -523,7 +663,6 @@ class TestSimulationConfigBuilderWorkflow:
             # Should only return non-workflow-execution nodes
             assert result == ["node1", "node2"]
 
-    @pytest.mark.asyncio
     async def test_execute_with_action_tools(self, workflow):
         """Test execute workflow with action_tools parameter."""
         input_with_action_tools = SimulationConfigBuilderInput(
@@ -546,10 +685,15 @@ class TestSimulationConfigBuilderWorkflow:
                 assert workflow.action_tools_to_mock == ["tool1", "tool2"]
                 assert isinstance(result, SimulationConfigBuilderOutput)
 
+        assert workflow._should_include_node("generate_llm_model_response_tool1#1") == (
+            "generate_llm_model_response_tool1#1"
+        )
+
     def test_should_include_node_with_action_tools_match(self, workflow):
         """Test _should_include_node includes nodes matching action_tools_to_mock."""
         # Set action_tools_to_mock
         workflow.action_tools_to_mock = ["tool1", "custom_tool"]
+        workflow._compile_node_matchers()
 
         # Test node that matches action_tool
         result = workflow._should_include_node("some_tool1_activity")
@@ -563,6 +707,7 @@ class TestSimulationConfigBuilderWorkflow:
         """Test _should_include_node prioritizes action_tools over skip list."""
         # Set both action_tools_to_mock and nodes_to_skip
         workflow.action_tools_to_mock = ["generate_llm_model_response"]
+        workflow._compile_node_matchers()
         # generate_llm_model_response is also in nodes_to_skip by default
 
         # Should include because it matches action_tools_to_mock (higher priority)
@@ -2,6 +2,8 @@
 Integration tests for simulation workflows and services.
 """
 
+import asyncio
+import base64
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -21,7 +23,7 @@ from zamp_public_workflow_sdk.simulation.models import (
 from zamp_public_workflow_sdk.simulation.models.simulation_response import (
     SimulationStrategyOutput,
 )
-from zamp_public_workflow_sdk.simulation.models.simulation_s3 import UploadToS3Output
+from zamp_public_workflow_sdk.simulation.models.simulation_s3 import SimulationMemo, UploadToS3Output
 from zamp_public_workflow_sdk.simulation.workflow_simulation_service import (
     WorkflowSimulationService,
 )
@@ -30,6 +32,16 @@ from zamp_public_workflow_sdk.simulation.workflows.simulation_fetch_data_workflo
 )
 
 
+@pytest.fixture(autouse=True)
+def concurrent_strategies_patched():
+    """Answer workflow.patched outside a workflow event loop, as a run started after the concurrent-strategies patch."""
+    with patch(
+        "zamp_public_workflow_sdk.simulation.workflows.simulation_fetch_data_workflow.workflow.patched",
+        return_value=True,
+    ) as mock_patched:
+        yield mock_patched
+
+
 class TestSimulationFetchDataWorkflowIntegration:
     """Integration tests for SimulationFetchDataWorkflow."""
 
@@ -77,7 +89,6 @@ class TestSimulationFetchDataWorkflowIntegration:
         with pytest.raises(ValueError, match="Unknown strategy type: UNKNOWN_TYPE"):
             WorkflowSimulationService.get_strategy(mock_node_strategy)
 
-    @pytest.mark.asyncio
     async def test_execute_with_custom_output_strategies(self):
         """Test execute method with custom output strategies."""
         workflow = SimulationFetchDataWorkflow()
@@ -124,7 +135,11 @@ class TestSimulationFetchDataWorkflowIntegration:
         assert result.node_id_to_payload_map["node2#1"].output_payload == "output1"
         assert result.node_id_to_payload_map["node3#1"].output_payload == "output2"
 
-    @pytest.mark.asyncio
+        # The uploaded blob decodes back to the same memo
+        upload_input = mock_execute_activity.call_args.args[1]
+        uploaded_memo = SimulationMemo.model_validate_json(base64.b64decode(upload_input.blob_base64))
+        assert uploaded_memo == SimulationMemo(config=sim_config, node_id_to_payload_map=result.node_id_to_payload_map)
+
     async def test_execute_with_temporal_history_strategies(self):
         """Test execute method with temporal history strategies."""
         workflow = SimulationFetchDataWorkflow()
@@ -184,7 +199,6 @@ class TestSimulationFetchDataWorkflowIntegration:
             assert isinstance(result.node_id_to_payload_map["node2#1"], NodePayload)
             assert result.node_id_to_payload_map["node2#1"].output_payload == "history_output"
 
-    @pytest.mark.asyncio
     async def test_execute_with_mixed_strategies(self):
         """Test execute method with mixed strategy types."""
         workflow = SimulationFetchDataWorkflow()
@@ -249,7 +263,6 @@ class TestSimulationFetchDataWorkflowIntegration:
             assert isinstance(result.node_id_to_payload_map["node2#1"], NodePayload)
             assert result.node_id_to_payload_map["node2#1"].output_payload == "history_output"
 
-    @pytest.mark.asyncio
     async def test_execute_strategy_execution_failure(self):
         """Test execute method when strategy execution fails."""
         workflow = SimulationFetchDataWorkflow()
@@ -295,7 +308,102 @@ class TestSimulationFetchDataWorkflowIntegration:
             assert isinstance(result, SimulationFetchDataWorkflowOutput)
             assert len(result.node_id_to_payload_map) == 0  # No successful executions
 
-    @pytest.mark.asyncio
+    @staticmethod
+    def _three_strategy_input() -> SimulationFetchDataWorkflowInput:
+        """Input with three single-node custom-output strategies: a#1, b#1 and c#1, in that order."""
+        node_strategies = [
+            NodeStrategy(
+                strategy=SimulationStrategyConfig(
+                    type=StrategyType.CUSTOM_OUTPUT,
+                    config=CustomOutputConfig(output_value=name),
+                ),
+                nodes=[f"{name}#1"],
+            )
+            for name in ("a", "b", "c")
+        ]
+        return SimulationFetchDataWorkflowInput(
+            simulation_config=SimulationConfig(mock_config=NodeMockConfig(node_strategies=node_strategies)),
+            workflow_id="test_workflow_id",
+            bucket_name="test-bucket",
+        )
+
+    async def test_execute_runs_strategies_concurrently(self, concurrency_probe):
+        """Test strategies all start before any finishes, and results merge in strategy order despite a failure."""
+        workflow = SimulationFetchDataWorkflow()
+        input_data = self._three_strategy_input()
+        probe = concurrency_probe(3)
+
+        def get_strategy(node_strategy):
+            node_id = node_strategy.nodes[0]
+            position = ["a#1", "b#1", "c#1"].index(node_id)
+
+            async def execute(node_ids):
+                await probe.visit(node_id)
+                # Later strategies finish first, so the merge order cannot come from completion order
+                for _ in range(3 - position):
+                    await asyncio.sleep(0)
+                if node_id == "b#1":
+                    raise RuntimeError("Strategy failed")
+                return SimulationStrategyOutput(
+                    node_id_to_payload_map={
+                        node_id: NodePayload(node_id=node_id, input_payload=None, output_payload=node_id)
+                    }
+                )
+
+            return Mock(execute=execute)
+
+        with (
+            patch.object(WorkflowSimulationService, "get_strategy", side_effect=get_strategy),
+            patch.object(workflow, "_upload_simulation_data_to_s3", new_callable=AsyncMock, return_value="s3-key"),
+        ):
+            result = await workflow.execute(input_data)
+
+        assert probe.max_in_flight == 3
+        assert list(result.node_id_to_payload_map) == ["a#1", "c#1"]
+        assert result.s3_key == "s3-key"
+
+    async def test_execute_unpatched_runs_strategies_sequentially(
+        self, concurrent_strategies_patched, concurrency_probe
+    ):
+        """Test runs started before the concurrent-strategies patch finish each strategy before the next starts."""
+        concurrent_strategies_patched.return_value = False
+        workflow = SimulationFetchDataWorkflow()
+        input_data = self._three_strategy_input()
+        probe = concurrency_probe(3)
+
+        def get_strategy(node_strategy):
+            async def execute(node_ids):
+                await probe.visit(node_ids[0])
+                return SimulationStrategyOutput()
+
+            return Mock(execute=execute)
+
+        with (
+            patch.object(WorkflowSimulationService, "get_strategy", side_effect=get_strategy),
+            patch.object(workflow, "_upload_simulation_data_to_s3", new_callable=AsyncMock, return_value="s3-key"),
+        ):
+            await workflow.execute(input_data)
+
+        assert probe.events == probe.sequential_events(["a#1", "b#1", "c#1"])
+
+    async def test_execute_upload_failure_propagates_original_exception(self):
+        """Test execute re-raises the upload error unchanged instead of wrapping it."""
+        workflow = SimulationFetchDataWorkflow()
+
+        sim_config = SimulationConfig(mock_config=NodeMockConfig(node_strategies=[]))
+        input_data = SimulationFetchDataWorkflowInput(
+            simulation_config=sim_config, workflow_id="test_workflow_id", bucket_name="test-bucket"
+        )
+        upload_error = RuntimeError("S3 unavailable")
+
+        with patch.object(workflow, "_upload_simulation_data_to_s3", new_callable=AsyncMock) as mock_upload:
+            mock_upload.side_effect = upload_error
+
+            with pytest.raises(RuntimeError) as exc_info:
+                await workflow.execute(input_data)
+
+        assert exc_info.value is upload_error
+
     async def test_execute_strategy_returns_empty_outputs(self):
         """Test execute method when strategy returns empty node_outputs."""
         workflow = SimulationFetchDataWorkflow()
@@ -341,7 +449,6 @@ class TestSimulationFetchDataWorkflowIntegration:
             assert isinstance(result, SimulationFetchDataWorkflowOutput)
             assert len(result.node_id_to_payload_map) == 0  # No mock outputs
 
-    @pytest.mark.asyncio
     async def test_execute_strategy_returns_none_output(self):
         """Test execute method when strategy returns None output."""
         workflow = SimulationFetchDataWorkflow()
@@ -391,7 +498,6 @@ class TestSimulationFetchDataWorkflowIntegration:
 class TestSimulationServiceIntegration:
     """Integration tests for WorkflowSimulationService with real workflows."""
 
-    @pytest.mark.asyncio
     async def test_initialize_simulation_data_integration(self):
         """Test full integration of simulation data initialization."""
         from zamp_public_workflow_sdk.simulation.workflow_simulation_service import (
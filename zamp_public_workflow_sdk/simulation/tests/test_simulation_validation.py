@@ -111,6 +111,27 @@ class TestNodeComparison:
         with pytest.raises(ValidationError):
             NodeComparison(is_mocked=True)  # Missing required node_id
 
+    @pytest.mark.parametrize(
+        "inputs_match, outputs_match, error, expected",
+        [
+            (True, True, None, True),
+            (True, None, None, True),
+            (True, False, None, False),
+            (False, True, None, False),
+            (None, None, None, False),
+            (None, None, "Node not found in golden workflow", False),
+        ],
+        ids=["all_match", "outputs_not_compared", "outputs_mismatch", "inputs_mismatch", "not_compared", "error"],
+    )
+    def test_node_comparison_matched(self, inputs_match, outputs_match, error, expected):
+        """Test matched requires matching inputs, no output mismatch and no error."""
+        comparison = NodeComparison(
+            node_id="activity#1", is_mocked=True, inputs_match=inputs_match, outputs_match=outputs_match, error=error
+        )
+
+        assert comparison.matched is expected
+        assert "matched" not in comparison.model_dump()
+
 
 class TestSimulationValidatorInput:
     """Test SimulationValidatorInput model."""
@@ -2,18 +2,26 @@
 Unit tests for simulation validator workflow.
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 
+from deepdiff import DeepDiff
+
 from zamp_public_workflow_sdk.simulation.workflows.simulation_validator_workflow import (
+    CONCURRENT_VALIDATION_PATCH_ID,
     SimulationValidatorWorkflow,
     MAIN_WORKFLOW_IDENTIFIER,
+    _path_prefixes,
 )
 from zamp_public_workflow_sdk.simulation.models.simulation_validation import (
     SimulationValidatorInput,
     SimulationValidatorOutput,
     NodeComparison,
 )
+from zamp_public_workflow_sdk.temporal.workflow_history.constants import EventType, EventTypeToAttributesKey
+from zamp_public_workflow_sdk.temporal.workflow_history.models import WorkflowHistory
 from zamp_public_workflow_sdk.simulation.models import (
     SimulationConfig,
     NodeMockConfig,
@@ -24,6 +32,16 @@ from zamp_public_workflow_sdk.simulation.models import (
 )
 
 
+@pytest.fixture(autouse=True)
+def concurrent_validation_patched():
+    """Answer workflow.patched outside a workflow event loop, as a run started after the concurrent validation patch."""
+    with patch(
+        "zamp_public_workflow_sdk.simulation.workflows.simulation_validator_workflow.workflow.patched",
+        return_value=True,
+    ) as mock_patched:
+        yield mock_patched
+
+
 class TestSimulationValidatorWorkflow:
     """Test SimulationValidatorWorkflow class."""
 
@@ -145,6 +163,16 @@ class TestSimulationValidatorWorkflow:
         assert output.nodes_missing_in_golden_workflow is None
         assert output.validation_passed is True
 
+    def test_build_output_uncompared_outputs_match(self):
+        """Test a node whose outputs were not compared counts as matching when its inputs match."""
+        comparisons = [NodeComparison(node_id="activity#1", is_mocked=True, inputs_match=True, outputs_match=None)]
+
+        output = self.workflow._build_output(comparisons)
+
+        assert output.matching_nodes_count == 1
+        assert output.mismatched_nodes_count == 0
+        assert output.validation_passed is True
+
     def test_build_output_mismatched_nodes(self):
         """Test building output with mismatched nodes."""
         comparisons = [
@@ -249,6 +277,18 @@ class TestSimulationValidatorWorkflow:
         assert comparison.outputs_match is None
         assert comparison.error == "Test error message"
 
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            ("Child#1", ["Child#1"]),
+            ("Parent#1.Child#1", ["Parent#1", "Parent#1.Child#1"]),
+            ("A#1.B#1.C#1", ["A#1", "A#1.B#1", "A#1.B#1.C#1"]),
+        ],
+    )
+    def test_path_prefixes(self, path, expected):
+        """Test that every ancestor path is yielded before the path itself."""
+        assert list(_path_prefixes(path)) == expected
+
     def test_group_nodes_by_parent_workflow_main_workflow(self):
         """Test grouping nodes by parent workflow for main workflow nodes."""
         node_ids = ["activity#1", "activity#2"]
@@ -282,27 +322,20 @@ class TestSimulationValidatorWorkflow:
         }
         assert groups == expected
 
-    def test_get_workflow_path_from_node_simple(self):
-        """Test getting workflow path from simple node ID."""
-        path = self.workflow._get_workflow_path_from_node("Child#1.activity#1", "Child#1")
-
-        assert path == "Child#1"
-
-    def test_get_workflow_path_from_node_nested(self):
-        """Test getting workflow path from nested node ID."""
-        path = self.workflow._get_workflow_path_from_node("Parent#1.Child#1.activity#1", "Child#1")
-
-        assert path == "Parent#1.Child#1"
-
-    def test_get_workflow_path_from_node_not_found(self):
-        """Test getting workflow path when child workflow ID not found."""
-        path = self.workflow._get_workflow_path_from_node("Parent#1.activity#1", "Child#1")
+    def test_group_nodes_by_parent_workflow_keeps_input_order(self):
+        """Test grouping keeps the caller's order, since execute already passes the node IDs sorted."""
+        node_ids = ["Child#1.activity#2", "activity#2", "Child#1.activity#1", "activity#1"]
+        groups = self.workflow._group_nodes_by_parent_workflow(node_ids)
 
-        assert path == "Parent#1"
+        assert list(groups.items()) == [
+            ("Child#1", ["Child#1.activity#2", "Child#1.activity#1"]),
+            (MAIN_WORKFLOW_IDENTIFIER, ["activity#2", "activity#1"]),
+        ]
+        assert list(groups) == ["Child#1", MAIN_WORKFLOW_IDENTIFIER]
 
-    @pytest.mark.asyncio
     async def test_compare_node_matching_inputs_outputs(self):
         """Test comparing node with matching inputs and outputs."""
+        self.workflow.compare_mocked_outputs = True
         # Mock node data
         reference_node = Mock()
         reference_node.input_payload = {"param": "value"}
@@ -314,9 +347,8 @@ class TestSimulationValidatorWorkflow:
 
         reference_nodes = {"activity#1": reference_node}
         golden_nodes = {"activity#1": golden_node}
-        mocked_nodes = {"activity#1"}
 
-        comparison = await self.workflow._compare_node("activity#1", mocked_nodes, reference_nodes, golden_nodes)
+        comparison = await self.workflow._compare_node("activity#1", True, reference_nodes, golden_nodes)
 
         assert comparison.node_id == "activity#1"
         assert comparison.is_mocked is True
@@ -330,9 +362,9 @@ class TestSimulationValidatorWorkflow:
         assert comparison.output_difference is None
         assert comparison.error is None
 
-    @pytest.mark.asyncio
     async def test_compare_node_mismatched_inputs_outputs(self):
         """Test comparing node with mismatched inputs and outputs."""
+        self.workflow.compare_mocked_outputs = True
         # Mock node data
         reference_node = Mock()
         reference_node.input_payload = {"param": "value1"}
@@ -344,9 +376,8 @@ class TestSimulationValidatorWorkflow:
 
         reference_nodes = {"activity#1": reference_node}
         golden_nodes = {"activity#1": golden_node}
-        mocked_nodes = {"activity#1"}
 
-        comparison = await self.workflow._compare_node("activity#1", mocked_nodes, reference_nodes, golden_nodes)
+        comparison = await self.workflow._compare_node("activity#1", True, reference_nodes, golden_nodes)
 
         assert comparison.node_id == "activity#1"
         assert comparison.is_mocked is True
@@ -360,14 +391,92 @@ class TestSimulationValidatorWorkflow:
         assert comparison.output_difference is not None
         assert comparison.error is None
 
-    @pytest.mark.asyncio
+    def test_diff_payloads_equal_skips_deepdiff(self):
+        """Test equal payloads are matched without running DeepDiff."""
+        with patch(
+            "zamp_public_workflow_sdk.simulation.workflows.simulation_validator_workflow.DeepDiff"
+        ) as mock_deepdiff:
+            assert self.workflow._diff_payloads({"param": [1, 2]}, {"param": [1, 2]}) is None
+
+        mock_deepdiff.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "expected, actual",
+        [(None, {"param": "value"}), (1, "1"), ([1], (1,)), ({"param": 1}, None)],
+        ids=["none_to_dict", "int_to_str", "list_to_tuple", "dict_to_none"],
+    )
+    def test_diff_payloads_root_type_change_matches_deepdiff(self, expected, actual):
+        """Test root type changes are reported without DeepDiff, in the same shape DeepDiff produces."""
+        deepdiff_result = dict(DeepDiff(expected, actual, ignore_order=False, verbose_level=2))
+
+        with patch(
+            "zamp_public_workflow_sdk.simulation.workflows.simulation_validator_workflow.DeepDiff"
+        ) as mock_deepdiff:
+            diff = self.workflow._diff_payloads(expected, actual)
+
+        mock_deepdiff.assert_not_called()
+        assert diff == deepdiff_result
+
+    def test_diff_payloads_same_object_skips_deepdiff(self):
+        """Test a payload compared with itself matches without running DeepDiff."""
+        payload = {"param": [1, {"nested": "value"}]}
+
+        with patch(
+            "zamp_public_workflow_sdk.simulation.workflows.simulation_validator_workflow.DeepDiff"
+        ) as mock_deepdiff:
+            assert self.workflow._diff_payloads(payload, payload) is None
+
+        mock_deepdiff.assert_not_called()
+
+    @pytest.mark.parametrize("error", [RecursionError("too deep"), TypeError("not comparable")])
+    def test_diff_payloads_walker_error_falls_back_to_deepdiff(self, error):
+        """Test payloads the equality walker cannot handle are diffed by DeepDiff instead."""
+        with (
+            patch(
+                "zamp_public_workflow_sdk.simulation.workflows.simulation_validator_workflow._payloads_equal",
+                side_effect=error,
+            ),
+            patch(
+                "zamp_public_workflow_sdk.simulation.workflows.simulation_validator_workflow.DeepDiff",
+                return_value={},
+            ) as mock_deepdiff,
+        ):
+            assert self.workflow._diff_payloads({"param": 1}, {"param": 1}) is None
+
+        mock_deepdiff.assert_called_once()
+
+    def test_diff_payloads_unexpected_walker_error_propagates(self):
+        """Test errors other than the walker's known failure modes are not swallowed."""
+        with patch(
+            "zamp_public_workflow_sdk.simulation.workflows.simulation_validator_workflow._payloads_equal",
+            side_effect=KeyError("param"),
+        ):
+            with pytest.raises(KeyError):
+                self.workflow._diff_payloads({"param": 1}, {"param": 1})
+
+    def test_diff_payloads_type_change_only(self):
+        """Test payloads that are == but differ in type still report the type change."""
+        diff = self.workflow._diff_payloads({"param": 1}, {"param": 1.0})
+
+        assert diff is not None
+        assert "type_changes" in diff
+
+    async def test_compare_node_result_equals_validated_model(self):
+        """Test the unvalidated comparison result matches a validated NodeComparison with the same fields."""
+        reference_nodes = {"activity#1": Mock(input_payload={"param": "value1"}, output_payload={"result": "ok"})}
+        golden_nodes = {"activity#1": Mock(input_payload={"param": "value2"}, output_payload={"result": "ok"})}
+
+        comparison = await self.workflow._compare_node("activity#1", True, reference_nodes, golden_nodes)
+
+        assert comparison == NodeComparison.model_validate(comparison.model_dump())
+        assert comparison.error is None
+
     async def test_compare_node_reference_node_not_found(self):
         """Test comparing node when reference node is not found."""
         reference_nodes = {}
         golden_nodes = {"activity#1": Mock()}
-        mocked_nodes = {"activity#1"}
 
-        comparison = await self.workflow._compare_node("activity#1", mocked_nodes, reference_nodes, golden_nodes)
+        comparison = await self.workflow._compare_node("activity#1", True, reference_nodes, golden_nodes)
 
         assert comparison.node_id == "activity#1"
         assert comparison.is_mocked is True
@@ -375,14 +484,12 @@ class TestSimulationValidatorWorkflow:
         assert comparison.outputs_match is None
         assert comparison.error == "Node not found in simulation workflow"
 
-    @pytest.mark.asyncio
     async def test_compare_node_golden_node_not_found(self):
         """Test comparing node when golden node is not found."""
         reference_nodes = {"activity#1": Mock()}
         golden_nodes = {}
-        mocked_nodes = {"activity#1"}
 
-        comparison = await self.workflow._compare_node("activity#1", mocked_nodes, reference_nodes, golden_nodes)
+        comparison = await self.workflow._compare_node("activity#1", True, reference_nodes, golden_nodes)
 
         assert comparison.node_id == "activity#1"
         assert comparison.is_mocked is True
@@ -390,7 +497,48 @@ class TestSimulationValidatorWorkflow:
         assert comparison.outputs_match is None
         assert comparison.error == "Node not found in golden workflow"
 
-    @pytest.mark.asyncio
+    async def test_compare_node_falsy_node_is_not_missing(self):
+        """Test a present node that evaluates as falsy is compared rather than reported missing."""
+        self.workflow.compare_mocked_outputs = True
+        reference_node = Mock(input_payload={"param": "value"}, output_payload=None)
+        reference_node.__bool__ = Mock(return_value=False)
+        golden_node = Mock(input_payload={"param": "value"}, output_payload=None)
+        golden_node.__bool__ = Mock(return_value=False)
+
+        comparison = await self.workflow._compare_node(
+            "activity#1", True, {"activity#1": reference_node}, {"activity#1": golden_node}
+        )
+
+        assert comparison.error is None
+        assert comparison.inputs_match is True
+        assert comparison.outputs_match is True
+
+    async def test_compare_node_skips_mocked_outputs_by_default(self):
+        """Test mocked node outputs are not diffed unless compare_mocked_outputs is set."""
+        simulation_nodes = {"activity#1": Mock(input_payload={"param": "value"}, output_payload={"result": "mock"})}
+        golden_nodes = {"activity#1": Mock(input_payload={"param": "value"}, output_payload={"result": "real"})}
+
+        with patch.object(self.workflow, "_diff_payloads", wraps=self.workflow._diff_payloads) as mock_diff:
+            comparison = await self.workflow._compare_node("activity#1", True, simulation_nodes, golden_nodes)
+
+        mock_diff.assert_called_once_with({"param": "value"}, {"param": "value"})
+        assert comparison.inputs_match is True
+        assert comparison.outputs_match is None
+        assert comparison.output_difference is None
+        assert comparison.actual_output == {"result": "mock"}
+        assert comparison.expected_output == {"result": "real"}
+
+    async def test_compare_node_diffs_outputs_of_unmocked_nodes(self):
+        """Test outputs of nodes that are not mocked are always diffed."""
+        simulation_nodes = {"activity#1": Mock(input_payload={"param": "value"}, output_payload={"result": "a"})}
+        golden_nodes = {"activity#1": Mock(input_payload={"param": "value"}, output_payload={"result": "b"})}
+
+        comparison = await self.workflow._compare_node("activity#1", False, simulation_nodes, golden_nodes)
+
+        assert comparison.inputs_match is True
+        assert comparison.outputs_match is False
+        assert comparison.output_difference is not None
+
     async def test_compare_node_exception(self):
         """Test comparing node when exception occurs."""
         reference_node = Mock()
@@ -398,20 +546,19 @@ class TestSimulationValidatorWorkflow:
         reference_node.output_payload = {"result": "success"}
 
         golden_node = Mock()
-        golden_node.input_payload = {"param": "value"}
+        golden_node.input_payload = {"param": "other_value"}
         golden_node.output_payload = {"result": "success"}
 
         reference_nodes = {"activity#1": reference_node}
         golden_nodes = {"activity#1": golden_node}
-        mocked_nodes = {"activity#1"}
 
-        # Mock DeepDiff to raise an exception
+        # Mock DeepDiff to raise an exception; it only runs for payloads that are not equal
         with patch(
             "zamp_public_workflow_sdk.simulation.workflows.simulation_validator_workflow.DeepDiff"
         ) as mock_deepdiff:
             mock_deepdiff.side_effect = Exception("Test exception")
 
-            comparison = await self.workflow._compare_node("activity#1", mocked_nodes, reference_nodes, golden_nodes)
+            comparison = await self.workflow._compare_node("activity#1", True, reference_nodes, golden_nodes)
 
             assert comparison.node_id == "activity#1"
             assert comparison.is_mocked is True
@@ -419,7 +566,6 @@ class TestSimulationValidatorWorkflow:
             assert comparison.outputs_match is None
             assert comparison.error == "Comparison error: Test exception"
 
-    @pytest.mark.asyncio
     async def test_compare_main_workflow_nodes(self):
         """Test comparing main workflow nodes."""
         # Mock workflow histories
@@ -439,15 +585,13 @@ class TestSimulationValidatorWorkflow:
         self.workflow.golden_workflow_histories[MAIN_WORKFLOW_IDENTIFIER] = golden_history
 
         node_ids = ["activity#1", "activity#2"]
-        mocked_nodes = {"activity#1", "activity#2"}
 
-        comparisons = await self.workflow._compare_main_workflow_nodes(node_ids, mocked_nodes)
+        comparisons = await self.workflow._compare_main_workflow_nodes(node_ids)
 
         assert len(comparisons) == 2
         assert comparisons[0].node_id == "activity#1"
         assert comparisons[1].node_id == "activity#2"
 
-    @pytest.mark.asyncio
     async def test_fetch_workflow_history_success(self):
         """Test successful workflow history fetching."""
         mock_history = Mock()
@@ -465,7 +609,21 @@ class TestSimulationValidatorWorkflow:
             assert result == mock_history
             mock_actions_hub.execute_child_workflow.assert_called_once()
 
-    @pytest.mark.asyncio
+    async def test_fetch_workflow_history_passes_node_filter(self):
+        """Test the node filter is forwarded to the history fetch input."""
+        with patch(
+            "zamp_public_workflow_sdk.simulation.workflows.simulation_validator_workflow.ActionsHub"
+        ) as mock_actions_hub:
+            mock_actions_hub.execute_child_workflow = AsyncMock(return_value=Mock(events=[]))
+
+            await self.workflow._fetch_workflow_history(
+                workflow_id="test-workflow", run_id="test-run", description="test", node_ids=["activity#1"]
+            )
+
+            fetch_input = mock_actions_hub.execute_child_workflow.call_args.args[1]
+            assert fetch_input.node_ids == ["activity#1"]
+            assert fetch_input.decode_payloads is True
+
     async def test_fetch_workflow_history_failure(self):
         """Test workflow history fetching failure."""
         with patch(
@@ -478,7 +636,6 @@ class TestSimulationValidatorWorkflow:
                     workflow_id="test-workflow", run_id="test-run", description="test"
                 )
 
-    @pytest.mark.asyncio
     async def test_fetch_and_cache_main_workflows(self):
         """Test fetching and caching main workflows."""
         mock_reference_history = Mock()
@@ -493,10 +650,41 @@ class TestSimulationValidatorWorkflow:
             assert self.workflow.golden_workflow_histories[MAIN_WORKFLOW_IDENTIFIER] == mock_golden_history
             assert mock_fetch.call_count == 2
 
-    @pytest.mark.asyncio
+    async def test_fetch_and_cache_main_workflows_fetches_concurrently(self, concurrency_probe):
+        """Test the simulation and golden main histories are fetched concurrently."""
+        histories = {"simulation": Mock(), "golden": Mock()}
+        probe = concurrency_probe(2)
+
+        async def fetch(workflow_id, run_id, description, node_ids=None):
+            await probe.visit(description)
+            return histories[description]
+
+        with patch.object(self.workflow, "_fetch_workflow_history", side_effect=fetch):
+            await self.workflow._fetch_and_cache_main_workflows(self.validator_input)
+
+        assert probe.max_in_flight == 2
+        assert self.workflow.simulation_workflow_histories[MAIN_WORKFLOW_IDENTIFIER] is histories["simulation"]
+        assert self.workflow.golden_workflow_histories[MAIN_WORKFLOW_IDENTIFIER] is histories["golden"]
+
+    async def test_fetch_and_cache_main_workflows_unpatched_fetches_sequentially(
+        self, concurrent_validation_patched, concurrency_probe
+    ):
+        """Test runs started before the validation patch fetch the golden history after the simulation one."""
+        concurrent_validation_patched.return_value = False
+        probe = concurrency_probe(2)
+
+        async def fetch(workflow_id, run_id, description, node_ids=None):
+            await probe.visit(description)
+            return Mock(name=description)
+
+        with patch.object(self.workflow, "_fetch_workflow_history", side_effect=fetch):
+            await self.workflow._fetch_and_cache_main_workflows(self.validator_input)
+
+        assert probe.events == probe.sequential_events(["simulation", "golden"])
+
     async def test_compare_all_nodes_main_workflow_only(self):
         """Test comparing all nodes with only main workflow nodes."""
-        mocked_nodes = {"activity#1", "activity#2"}
+        mocked_nodes = ["activity#1", "activity#2"]
 
         with patch.object(self.workflow, "_compare_main_workflow_nodes", new_callable=AsyncMock) as mock_compare_main:
             mock_compare_main.return_value = [
@@ -515,12 +703,10 @@ class TestSimulationValidatorWorkflow:
             mock_compare_main.assert_called_once()
             call_args = mock_compare_main.call_args[0]
             assert set(call_args[0]) == {"activity#1", "activity#2"}
-            assert call_args[1] == mocked_nodes
 
-    @pytest.mark.asyncio
     async def test_compare_all_nodes_with_child_workflows(self):
         """Test comparing all nodes with child workflow nodes."""
-        mocked_nodes = {"activity#1", "Child#1.activity#2"}
+        mocked_nodes = ["Child#1.activity#2", "activity#1"]
 
         with patch.object(self.workflow, "_compare_main_workflow_nodes", new_callable=AsyncMock) as mock_compare_main:
             with patch.object(
@@ -536,10 +722,55 @@ class TestSimulationValidatorWorkflow:
                 node_ids = [comp.node_id for comp in comparisons]
                 assert "activity#1" in node_ids
                 assert "Child#1.activity#2" in node_ids
-                mock_compare_main.assert_called_once_with(["activity#1"], mocked_nodes)
-                mock_compare_child.assert_called_once_with("Child#1", ["Child#1.activity#2"], mocked_nodes)
+                mock_compare_main.assert_called_once_with(["activity#1"])
+                mock_compare_child.assert_called_once_with("Child#1", ["Child#1.activity#2"])
+
+    async def test_compare_all_nodes_child_workflows_run_concurrently(self, concurrency_probe):
+        """Test child workflow groups are compared concurrently and results keep group order."""
+        mocked_nodes = ["ChildA#1.activity#1", "ChildB#1.activity#1"]
+        probe = concurrency_probe(2)
+
+        async def compare_child(parent_workflow_id, node_ids):
+            await probe.visit(parent_workflow_id)
+            return [NodeComparison(node_id=node_id, is_mocked=True) for node_id in node_ids]
+
+        with patch.object(self.workflow, "_compare_child_workflow_nodes", side_effect=compare_child):
+            comparisons = await self.workflow._compare_all_nodes(mocked_nodes)
+
+        assert probe.max_in_flight == 2
+        expected_order = [
+            node_id
+            for node_ids in self.workflow._group_nodes_by_parent_workflow(mocked_nodes).values()
+            for node_id in node_ids
+        ]
+        assert [comp.node_id for comp in comparisons] == expected_order
+
+    async def test_compare_all_nodes_unpatched_compares_groups_sequentially(
+        self, concurrent_validation_patched, concurrency_probe
+    ):
+        """Test runs started before the validation patch finish each node group before starting the next."""
+        concurrent_validation_patched.return_value = False
+        mocked_nodes = ["ChildA#1.activity#1", "ChildB#1.activity#1", "activity#1"]
+        probe = concurrency_probe(3)
+
+        async def compare_group(group_id, node_ids):
+            await probe.visit(group_id)
+            return [NodeComparison(node_id=node_id, is_mocked=True) for node_id in node_ids]
+
+        async def compare_main(node_ids):
+            return await compare_group(MAIN_WORKFLOW_IDENTIFIER, node_ids)
+
+        with (
+            patch.object(self.workflow, "_compare_child_workflow_nodes", side_effect=compare_group),
+            patch.object(self.workflow, "_compare_main_workflow_nodes", side_effect=compare_main),
+        ):
+            comparisons = await self.workflow._compare_all_nodes(mocked_nodes)
+
+        group_ids = list(self.workflow._group_nodes_by_parent_workflow(mocked_nodes))
+        assert probe.events == probe.sequential_events(group_ids)
+        assert [comp.node_id for comp in comparisons] == mocked_nodes
+        concurrent_validation_patched.assert_called_with(CONCURRENT_VALIDATION_PATCH_ID)
 
-    @pytest.mark.asyncio
     async def test_execute_no_mocked_nodes(self):
         """Test execute method when no mocked nodes are found."""
         empty_mock_config = NodeMockConfig(node_strategies=[])
@@ -557,7 +788,6 @@ class TestSimulationValidatorWorkflow:
         assert result.total_nodes_compared == 0
         assert result.validation_passed is True
 
-    @pytest.mark.asyncio
     async def test_execute_with_mocked_nodes(self):
         """Test execute method with mocked nodes."""
         with patch.object(self.workflow, "_fetch_and_cache_main_workflows", new_callable=AsyncMock) as mock_fetch:
@@ -575,10 +805,121 @@ class TestSimulationValidatorWorkflow:
 
                 assert result.total_nodes_compared == 1
                 assert result.validation_passed is True
-                mock_fetch.assert_called_once_with(self.validator_input)
-                mock_compare.assert_called_once_with({"activity#1", "Child#1.activity#2"})
+                mock_fetch.assert_called_once_with(self.validator_input, node_ids=["Child#1", "activity#1"])
+                mock_compare.assert_called_once_with(["Child#1.activity#2", "activity#1"])
+                assert self.workflow.compare_mocked_outputs is False
+
+    async def test_execute_main_fetch_keeps_parent_nodes_of_nested_mocks(self):
+        """Test the main history fetch is filtered to top-level node ids so parent child-workflow nodes survive."""
+        simulation_config = SimulationConfig(
+            mock_config=NodeMockConfig(
+                node_strategies=[
+                    NodeStrategy(
+                        strategy=SimulationStrategyConfig(
+                            type=StrategyType.CUSTOM_OUTPUT,
+                            config=CustomOutputConfig(output_value="test"),
+                        ),
+                        nodes=["Parent#1.Child#1.activity#1", "Parent#1.query#1", "activity#1"],
+                    )
+                ]
+            )
+        )
+        validator_input = self.validator_input.model_copy(update={"simulation_config": simulation_config})
+
+        with (
+            patch.object(self.workflow, "_fetch_and_cache_main_workflows", new_callable=AsyncMock) as mock_fetch,
+            patch.object(self.workflow, "_compare_all_nodes", new_callable=AsyncMock, return_value=[]) as mock_compare,
+        ):
+            await self.workflow.execute(validator_input)
+
+        mock_fetch.assert_called_once_with(validator_input, node_ids=["Parent#1", "activity#1"])
+        mock_compare.assert_called_once_with(["Parent#1.Child#1.activity#1", "Parent#1.query#1", "activity#1"])
+
+    async def test_execute_main_fetch_filter_keeps_parent_nodes_in_history(self):
+        """Test the main fetch node ids, applied by the real history filter, keep the parents of nested mocks."""
+        simulation_config = SimulationConfig(
+            mock_config=NodeMockConfig(
+                node_strategies=[
+                    NodeStrategy(
+                        strategy=SimulationStrategyConfig(
+                            type=StrategyType.CUSTOM_OUTPUT,
+                            config=CustomOutputConfig(output_value="test"),
+                        ),
+                        nodes=["Child#1.activity#1", "Parent#1.Child#1.activity#1", "activity#1"],
+                    )
+                ]
+            )
+        )
+        validator_input = self.validator_input.model_copy(update={"simulation_config": simulation_config})
+        child_started = (
+            EventType.START_CHILD_WORKFLOW_EXECUTION_INITIATED,
+            EventTypeToAttributesKey.START_CHILD_WORKFLOW_EXECUTION_INITIATED,
+        )
+        activity_scheduled = (EventType.ACTIVITY_TASK_SCHEDULED, EventTypeToAttributesKey.ACTIVITY_TASK_SCHEDULED)
+        history_nodes = [
+            ("Child#1", child_started),
+            ("Parent#1", child_started),
+            ("Other#1", child_started),
+            ("activity#1", activity_scheduled),
+            ("activity#2", activity_scheduled),
+        ]
+        main_history = WorkflowHistory(
+            workflow_id="main-wf",
+            run_id="main-run",
+            events=[
+                {
+                    "eventId": event_id,
+                    "eventType": event_type.value,
+                    attributes_key.value: {"header": {"fields": {"node_id": {"data": node_id}}}},
+                }
+                for event_id, (node_id, (event_type, attributes_key)) in enumerate(history_nodes, start=1)
+            ],
+        )
+
+        with (
+            patch.object(self.workflow, "_fetch_and_cache_main_workflows", new_callable=AsyncMock) as mock_fetch,
+            patch.object(self.workflow, "_compare_all_nodes", new_callable=AsyncMock, return_value=[]),
+        ):
+            await self.workflow.execute(validator_input)
+
+        main_fetch_node_ids = mock_fetch.call_args.kwargs["node_ids"]
+        assert set(main_history.get_nodes_data(target_node_ids=main_fetch_node_ids)) == {
+            "Child#1",
+            "Parent#1",
+            "activity#1",
+        }
+        # The filter matches node ids exactly, so the mocked ids themselves would drop the child workflow nodes
+        mocked_node_ids = ["Child#1.activity#1", "Parent#1.Child#1.activity#1", "activity#1"]
+        assert set(main_history.get_nodes_data(target_node_ids=mocked_node_ids)) == {"activity#1"}
+
+    async def test_execute_compare_mocked_outputs(self):
+        """Test execute applies the input's compare_mocked_outputs setting before comparing nodes."""
+        validator_input = self.validator_input.model_copy(update={"compare_mocked_outputs": True})
+
+        with patch.object(self.workflow, "_fetch_and_cache_main_workflows", new_callable=AsyncMock):
+            with patch.object(self.workflow, "_compare_all_nodes", new_callable=AsyncMock) as mock_compare:
+                mock_compare.return_value = []
+                await self.workflow.execute(validator_input)
+
+        assert self.workflow.compare_mocked_outputs is True
+
+    @pytest.mark.parametrize("compare_mocked_outputs, expected_skip_logs", [(False, 1), (True, 0)])
+    async def test_execute_logs_skipped_output_comparison_once(self, compare_mocked_outputs, expected_skip_logs):
+        """Test execute logs a single notice per run when mocked node outputs are not compared."""
+        validator_input = self.validator_input.model_copy(update={"compare_mocked_outputs": compare_mocked_outputs})
+
+        with (
+            patch.object(self.workflow, "_fetch_and_cache_main_workflows", new_callable=AsyncMock),
+            patch.object(self.workflow, "_compare_all_nodes", new_callable=AsyncMock, return_value=[]),
+            patch("zamp_public_workflow_sdk.simulation.workflows.simulation_validator_workflow.logger") as mock_logger,
+        ):
+            await self.workflow.execute(validator_input)
+
+        skip_logs = [
+            call for call in mock_logger.info.call_args_list if call.args[0].startswith("Skipping output comparison")
+        ]
+        assert len(skip_logs) == expected_skip_logs
 
-    @pytest.mark.asyncio
     async def test_fetch_nested_child_workflow_history_success(self):
         """Test successful nested child workflow history fetching."""
         # Mock parent workflow history
@@ -599,7 +940,6 @@ class TestSimulationValidatorWorkflow:
             assert self.workflow.simulation_workflow_histories["Child#1"] == child_history
             mock_fetch.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_fetch_nested_child_workflow_history_cached(self):
         """Test nested child workflow history fetching with cached result."""
         # Mock cached history
@@ -614,7 +954,83 @@ class TestSimulationValidatorWorkflow:
 
         assert result == cached_history
 
-    @pytest.mark.asyncio
+    async def test_fetch_nested_child_workflow_history_shares_in_flight_ancestor_fetch(self):
+        """Test concurrent traversals through a shared ancestor path fetch that ancestor once."""
+        parent_history = Mock()
+        parent_history.get_child_workflow_workflow_id_run_id.return_value = ("parent-workflow-id", "parent-run-id")
+        ancestor_history = Mock()
+        ancestor_history.get_child_workflow_workflow_id_run_id.side_effect = lambda path: (f"{path}-id", "run-id")
+        histories = {"parent-workflow-id": ancestor_history}
+
+        async def fetch(workflow_id, run_id, description, node_ids=None):
+            await asyncio.sleep(0)
+            return histories.get(workflow_id, Mock(name=workflow_id))
+
+        with patch.object(self.workflow, "_fetch_workflow_history", side_effect=fetch) as mock_fetch:
+            first, second = await asyncio.gather(
+                self.workflow._fetch_nested_child_workflow_history(
+                    parent_workflow_history=parent_history, full_child_path="Parent#1.ChildA#1", is_simulation=True
+                ),
+                self.workflow._fetch_nested_child_workflow_history(
+                    parent_workflow_history=parent_history, full_child_path="Parent#1.ChildB#1", is_simulation=True
+                ),
+            )
+
+        fetched_workflow_ids = [call.kwargs["workflow_id"] for call in mock_fetch.call_args_list]
+        assert sorted(fetched_workflow_ids) == ["Parent#1.ChildA#1-id", "Parent#1.ChildB#1-id", "parent-workflow-id"]
+        assert first is not second
+        assert self.workflow._pending_history_fetches == {}
+
+    async def test_fetch_nested_child_workflow_history_unpatched_fetches_each_traversal(
+        self, concurrent_validation_patched
+    ):
+        """Test runs started before the validation patch keep one fetch per uncached path, with no shared fetches."""
+        concurrent_validation_patched.return_value = False
+        parent_history = Mock()
+        parent_history.get_child_workflow_workflow_id_run_id.return_value = ("parent-workflow-id", "parent-run-id")
+        ancestor_history = Mock()
+        ancestor_history.get_child_workflow_workflow_id_run_id.side_effect = lambda path: (f"{path}-id", "run-id")
+        histories = {"parent-workflow-id": ancestor_history}
+
+        async def fetch(workflow_id, run_id, description, node_ids=None):
+            await asyncio.sleep(0)
+            return histories.get(workflow_id, Mock(name=workflow_id))
+
+        with patch.object(self.workflow, "_fetch_workflow_history", side_effect=fetch) as mock_fetch:
+            await asyncio.gather(
+                self.workflow._fetch_nested_child_workflow_history(
+                    parent_workflow_history=parent_history, full_child_path="Parent#1.ChildA#1", is_simulation=True
+                ),
+                self.workflow._fetch_nested_child_workflow_history(
+                    parent_workflow_history=parent_history, full_child_path="Parent#1.ChildB#1", is_simulation=True
+                ),
+            )
+
+        fetched_workflow_ids = [call.kwargs["workflow_id"] for call in mock_fetch.call_args_list]
+        assert fetched_workflow_ids.count("parent-workflow-id") == 2
+        assert self.workflow._pending_history_fetches == {}
+
+    async def test_fetch_nested_child_workflow_history_filters_to_needed_nodes(self):
+        """Test each level of a nested child path is fetched filtered to the nodes needed from it."""
+        mocked_nodes = ["Parent#1.Child#1.activity#1", "Parent#1.activity#2"]
+        parent_history = Mock()
+        parent_history.get_child_workflow_workflow_id_run_id.side_effect = lambda path: (f"{path}-id", "run-id")
+
+        with patch.object(self.workflow, "_compare_child_workflow_nodes", new_callable=AsyncMock) as mock_compare:
+            mock_compare.return_value = []
+            await self.workflow._compare_all_nodes(mocked_nodes)
+
+        with patch.object(self.workflow, "_fetch_workflow_history", new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = parent_history
+            await self.workflow._fetch_nested_child_workflow_history(
+                parent_workflow_history=parent_history, full_child_path="Parent#1.Child#1", is_simulation=True
+            )
+
+        assert [call.kwargs["node_ids"] for call in mock_fetch.call_args_list] == [
+            ["Parent#1.Child#1", "Parent#1.activity#2"],
+            ["Parent#1.Child#1.activity#1"],
+        ]
+
     async def test_fetch_nested_child_workflow_history_error(self):
         """Test nested child workflow history fetching with error."""
         parent_history = Mock()
@@ -625,7 +1041,6 @@ class TestSimulationValidatorWorkflow:
                 parent_workflow_history=parent_history, full_child_path="Child#1", is_simulation=True
             )
 
-    @pytest.mark.asyncio
     async def test_compare_child_workflow_nodes_success(self):
         """Test successful child workflow node comparison."""
         # Mock main workflow histories
@@ -649,13 +1064,50 @@ class TestSimulationValidatorWorkflow:
             mock_fetch.side_effect = [child_reference_history, child_golden_history]
 
             comparisons = await self.workflow._compare_child_workflow_nodes(
-                parent_workflow_id="Child#1", node_ids=["Child#1.activity#1"], mocked_nodes={"Child#1.activity#1"}
+                parent_workflow_id="Child#1", node_ids=["Child#1.activity#1"]
             )
 
             assert len(comparisons) == 1
             assert comparisons[0].node_id == "Child#1.activity#1"
 
-    @pytest.mark.asyncio
+    async def test_compare_child_workflow_nodes_uses_group_key_as_path(self):
+        """Test nested child workflow histories are fetched using the group key as the full path."""
+        self.workflow.simulation_workflow_histories[MAIN_WORKFLOW_IDENTIFIER] = Mock()
+        self.workflow.golden_workflow_histories[MAIN_WORKFLOW_IDENTIFIER] = Mock()
+        node_ids = ["Parent#1.Child#1.activity#1"]
+        groups = self.workflow._group_nodes_by_parent_workflow(node_ids)
+        child_history = Mock()
+        child_history.get_nodes_data.return_value = {}
+
+        with patch.object(self.workflow, "_fetch_nested_child_workflow_history", new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = child_history
+
+            await self.workflow._compare_child_workflow_nodes(parent_workflow_id="Parent#1.Child#1", node_ids=node_ids)
+
+        assert groups == {"Parent#1.Child#1": node_ids}
+        assert [call.kwargs["full_child_path"] for call in mock_fetch.call_args_list] == [
+            "Parent#1.Child#1",
+            "Parent#1.Child#1",
+        ]
+
+    async def test_compare_child_workflow_nodes_unpatched_fetches_sequentially(
+        self, concurrent_validation_patched, concurrency_probe
+    ):
+        """Test runs started before the validation patch fetch the golden child history after the simulation one."""
+        concurrent_validation_patched.return_value = False
+        self.workflow.simulation_workflow_histories[MAIN_WORKFLOW_IDENTIFIER] = Mock()
+        self.workflow.golden_workflow_histories[MAIN_WORKFLOW_IDENTIFIER] = Mock()
+        probe = concurrency_probe(2)
+
+        async def fetch_child(parent_workflow_history, full_child_path, is_simulation):
+            await probe.visit(is_simulation)
+            return Mock(**{"get_nodes_data.return_value": {}})
+
+        with patch.object(self.workflow, "_fetch_nested_child_workflow_history", side_effect=fetch_child):
+            await self.workflow._compare_child_workflow_nodes(parent_workflow_id="Child#1", node_ids=[])
+
+        assert probe.events == probe.sequential_events([True, False])
+
     async def test_compare_child_workflow_nodes_error(self):
         """Test child workflow node comparison with error."""
         # Mock main workflow histories
@@ -668,9 +1120,10 @@ class TestSimulationValidatorWorkflow:
             mock_fetch.side_effect = Exception("Failed to fetch child workflow")
 
             comparisons = await self.workflow._compare_child_workflow_nodes(
-                parent_workflow_id="Child#1", node_ids=["Child#1.activity#1"], mocked_nodes={"Child#1.activity#1"}
+                parent_workflow_id="Child#1", node_ids=["Child#1.activity#1"]
             )
 
             assert len(comparisons) == 1
             assert comparisons[0].node_id == "Child#1.activity#1"
             assert comparisons[0].error == "Failed to fetch child workflow history: Failed to fetch child workflow"
+            assert comparisons[0].is_mocked is True
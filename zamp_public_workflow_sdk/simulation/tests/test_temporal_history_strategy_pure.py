@@ -0,0 +1,139 @@
+"""
+Unit tests for the pure node-path helpers used by TemporalHistoryStrategyHandler.
+
+Kept apart from test_temporal_history_strategy.py so that targeted runs of these
+string-only tests do not pull in the history mocks and fixtures.
+"""
+
+import pytest
+
+from zamp_public_workflow_sdk.simulation.helper import (
+    MAIN_WORKFLOW_IDENTIFIER,
+    collect_nodes_per_workflow,
+    find_main_workflow_node,
+    get_workflow_path_from_node,
+    group_nodes_by_parent_workflow,
+)
+from zamp_public_workflow_sdk.simulation.models.node_payload import NodePayload
+from zamp_public_workflow_sdk.simulation.strategies.temporal_history_strategy import (
+    TemporalHistoryStrategyHandler,
+)
+
+
+class TestTemporalHistoryStrategyPureHelpers:
+    """Test cases for handler construction and node-path helpers that need no workflow history."""
+
+    def test_init(self):
+        """Test initialization of TemporalHistoryStrategyHandler."""
+        handler = TemporalHistoryStrategyHandler(
+            reference_workflow_id="workflow-123",
+            reference_workflow_run_id="run-456",
+        )
+
+        assert handler.reference_workflow_id == "workflow-123"
+        assert handler.reference_workflow_run_id == "run-456"
+        assert handler.workflow_histories_map == {}
+
+    @pytest.mark.parametrize(
+        "node_id,child_workflow_id,expected",
+        [
+            ("Parent#1.Child#1.activity#1", "Child#1", "Parent#1.Child#1"),
+            ("Child#1.activity#1", "Child#1", "Child#1"),
+            # child_workflow_id not found in the path falls back to the id itself
+            ("Parent#1.activity#1", "Child#1", "Child#1"),
+            # Only whole path segments match, never a substring of a longer id
+            ("Parent#1.Child#10.activity#1", "Child#1", "Child#1"),
+            ("Parent#1.Child#1.GrandChild#1.task#1", "GrandChild#1", "Parent#1.Child#1.GrandChild#1"),
+        ],
+        ids=["normal", "child_at_start", "child_not_found", "partial_segment", "deeply_nested"],
+    )
+    def test_get_workflow_path_from_node(self, node_id, child_workflow_id, expected):
+        """Test get_workflow_path_from_node method."""
+        assert get_workflow_path_from_node(node_id=node_id, child_workflow_id=child_workflow_id) == expected
+
+    @pytest.mark.parametrize(
+        "node_ids,expected",
+        [
+            (
+                ["Parent#1.query#1", "Parent#1.Child#1.activity#1"],
+                {
+                    "Parent#1": ["Parent#1.query#1", "Parent#1.Child#1"],
+                    "Parent#1.Child#1": ["Parent#1.Child#1.activity#1"],
+                },
+            ),
+            # Single-level nodes don't create any workflow entries
+            (["activity#1", "activity#2"], {}),
+            (
+                ["Parent#1.Child#1.GrandChild#1.activity#1"],
+                {
+                    "Parent#1": ["Parent#1.Child#1"],
+                    "Parent#1.Child#1": ["Parent#1.Child#1.GrandChild#1"],
+                    "Parent#1.Child#1.GrandChild#1": ["Parent#1.Child#1.GrandChild#1.activity#1"],
+                },
+            ),
+            # Shared prefixes are collected once, in first-seen order
+            (
+                ["Parent#1.Child#1.activity#1", "Parent#1.Child#1.activity#2"],
+                {
+                    "Parent#1": ["Parent#1.Child#1"],
+                    "Parent#1.Child#1": ["Parent#1.Child#1.activity#1", "Parent#1.Child#1.activity#2"],
+                },
+            ),
+        ],
+        ids=["simple", "single_level", "multiple_nested_levels", "shared_prefix"],
+    )
+    def test_collect_nodes_per_workflow(self, node_ids, expected):
+        """Test collect_nodes_per_workflow method."""
+        result = collect_nodes_per_workflow(node_ids)
+        assert list(result.items()) == list(expected.items())
+
+    @pytest.mark.parametrize(
+        "node_ids,expected",
+        [
+            (["activity#1", "activity#2"], {MAIN_WORKFLOW_IDENTIFIER: ["activity#1", "activity#2"]}),
+            (
+                ["activity#1", "Child#1.activity#1", "Child#1.activity#2"],
+                {MAIN_WORKFLOW_IDENTIFIER: ["activity#1"], "Child#1": ["Child#1.activity#1", "Child#1.activity#2"]},
+            ),
+            (
+                ["Parent#1.Child#1.activity#1", "Parent#1.activity#1"],
+                {"Parent#1.Child#1": ["Parent#1.Child#1.activity#1"], "Parent#1": ["Parent#1.activity#1"]},
+            ),
+            (
+                ["Parent#1.Child#1.GrandChild#1.activity#1"],
+                {"Parent#1.Child#1.GrandChild#1": ["Parent#1.Child#1.GrandChild#1.activity#1"]},
+            ),
+            # Groups preserve first-seen order of parents and of nodes within each parent
+            (
+                ["Child#1.activity#2", "activity#1", "Child#1.activity#1"],
+                {"Child#1": ["Child#1.activity#2", "Child#1.activity#1"], MAIN_WORKFLOW_IDENTIFIER: ["activity#1"]},
+            ),
+        ],
+        ids=["single_level", "child_workflow", "nested_child_workflows", "deeply_nested", "first_seen_order"],
+    )
+    def test_group_nodes_by_parent_workflow(self, node_ids, expected):
+        """Test group_nodes_by_parent_workflow method."""
+        result = group_nodes_by_parent_workflow(node_ids)
+        assert list(result.items()) == list(expected.items())
+
+    @pytest.mark.parametrize(
+        "node_id,expected_key",
+        [
+            ("Parent#1.activity#1", "Parent#1"),
+            ("Parent#1.Child#1.activity#1", "Parent#1.Child#1"),
+            # A workflow path that is only a prefix of a child payload key falls back to that payload
+            ("Other#1.activity#1", "Other#1.Nested#1"),
+            # Without a "." the node id itself is the workflow path
+            ("Parent#1", "Parent#1"),
+            ("Missing#1.activity#1", None),
+        ],
+        ids=["direct_parent", "nested_parent", "prefix_match", "no_separator", "not_found"],
+    )
+    def test_find_main_workflow_node(self, node_id, expected_key):
+        """Test find_main_workflow_node method."""
+        child_payloads = {
+            key: NodePayload(node_id=key, input_payload=None, output_payload=None)
+            for key in ["Parent#1", "Parent#1.Child#1", "Other#1.Nested#1"]
+        }
+        result = find_main_workflow_node(child_payloads=child_payloads, node_id=node_id)
+        assert result is (child_payloads[expected_key] if expected_key else None)
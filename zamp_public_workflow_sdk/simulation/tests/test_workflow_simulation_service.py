@@ -2,10 +2,13 @@
 Unit tests for WorkflowSimulationService.
 """
 
-from unittest.mock import AsyncMock, Mock, patch
+from functools import cache
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
 
+from zamp_public_workflow_sdk.actions_hub import ActionsHub
 from zamp_public_workflow_sdk.simulation.models import (
     CustomOutputConfig,
     ExecutionType,
@@ -25,319 +28,268 @@ from zamp_public_workflow_sdk.simulation.workflow_simulation_service import (
 from zamp_public_workflow_sdk.simulation.helper import payload_needs_decoding
 
 
-class TestWorkflowSimulationService:
-    """Test WorkflowSimulationService class."""
+# Payload literals and activity results shared across tests; built once at import and never mutated
+_DICT_OUTPUT = {"key": "value", "number": 123, "list": [1, 2, 3]}
+_LIST_OUTPUT = [1, 2, 3, "test", {"nested": "value"}]
+_NESTED_META = {"metadata": {"encoding": "json/plain", "nested": {"field": "value"}}, "data": "encoded_data"}
+_PAYLOAD_STR = NodePayload(node_id="node1#1", input_payload=None, output_payload="test_output")
+_PAYLOAD_DICT = NodePayload(node_id="node1#1", input_payload=None, output_payload=_DICT_OUTPUT)
+_PAYLOAD_LIST = NodePayload(node_id="node1#1", input_payload=None, output_payload=_LIST_OUTPUT)
+_MOCKED_STR_RESULT = MockedResultOutput(root="test_output")
+_MOCKED_DICT_RESULT = MockedResultOutput(root=_DICT_OUTPUT)
+_MOCKED_LIST_RESULT = MockedResultOutput(root=_LIST_OUTPUT)
+# Expected responses; a single model comparison covers the type and every field
+_EXPECTED_EXECUTE_RESPONSE = SimulationResponse(execution_type=ExecutionType.EXECUTE, execution_response=None)
+_EXPECTED_MOCK_STR_RESPONSE = SimulationResponse(execution_type=ExecutionType.MOCK, execution_response="test_output")
+_EXPECTED_MOCK_DICT_RESPONSE = SimulationResponse(execution_type=ExecutionType.MOCK, execution_response=_DICT_OUTPUT)
+_EXPECTED_MOCK_LIST_RESPONSE = SimulationResponse(execution_type=ExecutionType.MOCK, execution_response=_LIST_OUTPUT)
 
-    def test_init_with_simulation_config(self):
-        """Test initializing service with simulation config."""
-        mock_config = NodeMockConfig(
-            node_strategies=[
-                NodeStrategy(
-                    strategy=SimulationStrategyConfig(
-                        type=StrategyType.CUSTOM_OUTPUT,
-                        config=CustomOutputConfig(output_value="test_output"),
-                    ),
-                    nodes=["node1#1", "node2#1"],
-                )
-            ]
-        )
 
-        sim_config = SimulationConfig(mock_config=mock_config)
-        service = WorkflowSimulationService(sim_config)
+@cache
+def _custom_strategy(output_value: str, nodes: tuple[str, ...]) -> NodeStrategy:
+    """Validated custom-output NodeStrategy, cached per arguments since tests never mutate it."""
+    return NodeStrategy(
+        strategy=SimulationStrategyConfig(
+            type=StrategyType.CUSTOM_OUTPUT,
+            config=CustomOutputConfig(output_value=output_value),
+        ),
+        nodes=list(nodes),
+    )
 
-        assert service.simulation_config == sim_config
-        assert len(service.node_id_to_payload_map) == 0  # Empty until initialized
 
-    def test_init_without_simulation_config(self):
-        """Test initializing service without simulation config."""
-        service = WorkflowSimulationService(None)
+@cache
+def _temporal_strategy(workflow_id: str, run_id: str, nodes: tuple[str, ...]) -> NodeStrategy:
+    """Validated temporal-history NodeStrategy, cached per arguments since tests never mutate it."""
+    return NodeStrategy(
+        strategy=SimulationStrategyConfig(
+            type=StrategyType.TEMPORAL_HISTORY,
+            config=TemporalHistoryConfig(reference_workflow_id=workflow_id, reference_workflow_run_id=run_id),
+        ),
+        nodes=list(nodes),
+    )
 
-        assert service.simulation_config is None
-        assert len(service.node_id_to_payload_map) == 0
 
-    def test_init_with_multiple_strategies(self):
-        """Test initializing service with multiple node strategies."""
-        mock_config = NodeMockConfig(
-            node_strategies=[
-                NodeStrategy(
-                    strategy=SimulationStrategyConfig(
-                        type=StrategyType.CUSTOM_OUTPUT,
-                        config=CustomOutputConfig(output_value="output1"),
-                    ),
-                    nodes=["node1#1", "node2#1"],
-                ),
-                NodeStrategy(
-                    strategy=SimulationStrategyConfig(
-                        type=StrategyType.CUSTOM_OUTPUT,
-                        config=CustomOutputConfig(output_value="output2"),
-                    ),
-                    nodes=["node3#1"],
-                ),
-                NodeStrategy(
-                    strategy=SimulationStrategyConfig(
-                        type=StrategyType.TEMPORAL_HISTORY,
-                        config=TemporalHistoryConfig(
-                            reference_workflow_id="workflow-123",
-                            reference_workflow_run_id="run-456",
-                        ),
-                    ),
-                    nodes=["node4#1", "node5#1"],
-                ),
-            ]
-        )
+def _async_returning(value):
+    """Plain coroutine function stand-in for tests that only check the awaited result, not the call."""
 
-        sim_config = SimulationConfig(mock_config=mock_config)
-        service = WorkflowSimulationService(sim_config)
+    async def _stub(*args, **kwargs):
+        return value
 
-        assert service.simulation_config == sim_config
-        assert len(service.node_id_to_payload_map) == 0  # Empty until initialized
+    return _stub
 
-    @pytest.mark.asyncio
-    async def test_get_simulation_response_simulation_disabled(self):
-        """Test getting simulation response when simulation is disabled."""
-        service = WorkflowSimulationService(None)
 
-        response = await service.get_simulation_response("node1")
+# get_simulation_response tests share one disabled service; the fixture resets its state per test
+_SHARED_DISABLED_SERVICE = WorkflowSimulationService(None)
 
-        assert isinstance(response, SimulationResponse)
-        assert response.execution_type == ExecutionType.EXECUTE
-        assert response.execution_response is None
 
-    @pytest.mark.asyncio
-    async def test_get_simulation_response_node_found(self):
-        """Test getting simulation response when node is found."""
-        service = WorkflowSimulationService(None)
-        service.node_id_to_payload_map = {
-            "node1#1": NodePayload(node_id="node1#1", input_payload=None, output_payload="test_output")
-        }
-
-        with patch(
-            "zamp_public_workflow_sdk.actions_hub.action_hub_core.ActionsHub.execute_activity", new_callable=AsyncMock
-        ) as mock_execute:
-            mock_result = MockedResultOutput(root="test_output")
-            mock_execute.return_value = mock_result
-            response = await service.get_simulation_response("node1#1")
-
-            assert isinstance(response, SimulationResponse)
-            assert response.execution_type == ExecutionType.MOCK
-            assert response.execution_response == "test_output"
-
-    @pytest.mark.asyncio
-    async def test_get_simulation_response_node_not_found(self):
-        """Test getting simulation response when node is not found."""
-        service = WorkflowSimulationService(None)
-        service.node_id_to_payload_map = {"node1#1": "test_output"}
+@pytest.fixture
+def disabled_service():
+    """Shared WorkflowSimulationService without a simulation config, with an empty payload map."""
+    _SHARED_DISABLED_SERVICE.node_id_to_payload_map = {}
+    return _SHARED_DISABLED_SERVICE
 
-        response = await service.get_simulation_response("nonexistent_node")
 
-        assert isinstance(response, SimulationResponse)
-        assert response.execution_type == ExecutionType.EXECUTE
-        assert response.execution_response is None
+@pytest.fixture
+def mock_execute_child_workflow(monkeypatch):
+    """Swap ActionsHub.execute_child_workflow for an AsyncMock; monkeypatch restores the original on teardown."""
+    mock_execute = AsyncMock()
+    monkeypatch.setattr(ActionsHub, "execute_child_workflow", mock_execute)
+    return mock_execute
 
-    @pytest.mark.asyncio
-    async def test_get_simulation_response_with_dict_output(self):
-        """Test getting simulation response with dictionary output."""
-        dict_output = {"key": "value", "number": 123, "list": [1, 2, 3]}
 
-        service = WorkflowSimulationService(None)
-        service.node_id_to_payload_map = {
-            "node1#1": NodePayload(node_id="node1#1", input_payload=None, output_payload=dict_output)
-        }
-
-        with patch(
-            "zamp_public_workflow_sdk.actions_hub.action_hub_core.ActionsHub.execute_activity", new_callable=AsyncMock
-        ) as mock_execute:
-            mock_result = MockedResultOutput(root=dict_output)
-            mock_execute.return_value = mock_result
-            response = await service.get_simulation_response("node1#1")
-
-            assert isinstance(response, SimulationResponse)
-            assert response.execution_type == ExecutionType.MOCK
-            assert response.execution_response == dict_output
-
-    @pytest.mark.asyncio
-    async def test_get_simulation_response_with_list_output(self):
-        """Test getting simulation response with list output."""
-        list_output = [1, 2, 3, "test", {"nested": "value"}]
+@pytest.fixture(scope="module")
+def single_custom_output_config():
+    """SimulationConfig mocking node1#1 with a custom output; built once per module since tests only read it.
 
-        service = WorkflowSimulationService(None)
-        service.node_id_to_payload_map = {
-            "node1#1": NodePayload(node_id="node1#1", input_payload=None, output_payload=list_output)
-        }
-
-        with patch(
-            "zamp_public_workflow_sdk.actions_hub.action_hub_core.ActionsHub.execute_activity", new_callable=AsyncMock
-        ) as mock_execute:
-            mock_result = MockedResultOutput(root=list_output)
-            mock_execute.return_value = mock_result
-            response = await service.get_simulation_response("node1#1")
-
-            assert isinstance(response, SimulationResponse)
-            assert response.execution_type == ExecutionType.MOCK
-            assert response.execution_response == list_output
-
-    @pytest.mark.asyncio
-    async def test_initialize_simulation_data_success(self):
-        """Test successful initialization of simulation data."""
-        mock_config = NodeMockConfig(
+    Built with model_construct to skip validation; test_init_with_simulation_config covers the validated path.
+    """
+    return SimulationConfig.model_construct(
+        mock_config=NodeMockConfig.model_construct(
             node_strategies=[
-                NodeStrategy(
-                    strategy=SimulationStrategyConfig(
+                NodeStrategy.model_construct(
+                    strategy=SimulationStrategyConfig.model_construct(
                         type=StrategyType.CUSTOM_OUTPUT,
-                        config=CustomOutputConfig(output_value="test_output"),
+                        config=CustomOutputConfig.model_construct(output_value="test_output"),
                     ),
                     nodes=["node1#1"],
                 )
             ]
         )
-        sim_config = SimulationConfig(mock_config=mock_config)
-        service = WorkflowSimulationService(sim_config)
-
-        # Mock the workflow execution
-        mock_workflow_result = Mock()
-        mock_workflow_result.node_id_to_payload_map = {
-            "node1#1": NodePayload(node_id="node1#1", input_payload=None, output_payload="test_output")
-        }
+    )
 
-        with patch("zamp_public_workflow_sdk.actions_hub.ActionsHub") as mock_actions_hub:
-            mock_actions_hub.execute_child_workflow = AsyncMock(return_value=mock_workflow_result)
-            mock_actions_hub.clear_node_id_tracker = Mock()
 
-            await service._initialize_simulation_data(workflow_id="test_workflow_id", bucket_name="test-bucket")
+class TestWorkflowSimulationService:
+    """Test WorkflowSimulationService class."""
 
-            assert len(service.node_id_to_payload_map) == 1
-            assert service.node_id_to_payload_map["node1#1"].output_payload == "test_output"
-            mock_actions_hub.execute_child_workflow.assert_called_once()
+    def test_init_with_simulation_config(self):
+        """Test initializing service with simulation config."""
+        mock_config = NodeMockConfig(node_strategies=[_custom_strategy("test_output", ("node1#1", "node2#1"))])
 
-    @pytest.mark.asyncio
-    async def test_initialize_simulation_data_workflow_failure(self):
-        """Test initialization when workflow execution fails."""
-        mock_config = NodeMockConfig(
-            node_strategies=[
-                NodeStrategy(
-                    strategy=SimulationStrategyConfig(
-                        type=StrategyType.CUSTOM_OUTPUT,
-                        config=CustomOutputConfig(output_value="test_output"),
-                    ),
-                    nodes=["node1#1"],
-                )
-            ]
-        )
         sim_config = SimulationConfig(mock_config=mock_config)
         service = WorkflowSimulationService(sim_config)
 
-        with patch("zamp_public_workflow_sdk.actions_hub.ActionsHub") as mock_actions_hub:
-            mock_actions_hub.execute_child_workflow = AsyncMock(side_effect=Exception("Workflow failed"))
+        assert service.simulation_config == sim_config
+        assert len(service.node_id_to_payload_map) == 0  # Empty until initialized
 
-            with pytest.raises(Exception):
-                await service._initialize_simulation_data(workflow_id="test_workflow_id", bucket_name="test-bucket")
+    def test_init_without_simulation_config(self):
+        """Test initializing service without simulation config."""
+        service = WorkflowSimulationService(None)
 
-    @pytest.mark.asyncio
-    async def test_initialize_simulation_data_none_result(self):
-        """Test initialization when workflow returns None."""
+        assert service.simulation_config is None
+        assert len(service.node_id_to_payload_map) == 0
+
+    def test_init_with_multiple_strategies(self):
+        """Test initializing service with multiple node strategies."""
         mock_config = NodeMockConfig(
             node_strategies=[
-                NodeStrategy(
-                    strategy=SimulationStrategyConfig(
-                        type=StrategyType.CUSTOM_OUTPUT,
-                        config=CustomOutputConfig(output_value="test_output"),
-                    ),
-                    nodes=["node1#1"],
-                )
+                _custom_strategy("output1", ("node1#1", "node2#1")),
+                _custom_strategy("output2", ("node3#1",)),
+                _temporal_strategy("workflow-123", "run-456", ("node4#1", "node5#1")),
             ]
         )
+
         sim_config = SimulationConfig(mock_config=mock_config)
         service = WorkflowSimulationService(sim_config)
 
-        with patch("zamp_public_workflow_sdk.actions_hub.ActionsHub") as mock_actions_hub:
-            mock_actions_hub.execute_child_workflow = AsyncMock(return_value=None)
+        assert service.simulation_config == sim_config
+        assert len(service.node_id_to_payload_map) == 0  # Empty until initialized
 
-            with pytest.raises(AttributeError):
-                await service._initialize_simulation_data(workflow_id="test_workflow_id", bucket_name="test-bucket")
+    async def test_get_simulation_response_simulation_disabled(self, disabled_service):
+        """Test getting simulation response when simulation is disabled."""
+        response = await disabled_service.get_simulation_response("node1")
 
-    def test_payload_needs_decoding_with_encoding_metadata(self):
-        """Test that payload with encoding metadata returns True."""
-        payload = {"metadata": {"encoding": "json/plain"}, "data": "some_encoded_data"}
+        assert response == _EXPECTED_EXECUTE_RESPONSE
 
-        assert payload_needs_decoding(payload) is True
+    async def test_get_simulation_response_execute_without_activity(self, disabled_service, monkeypatch):
+        """Test that unmocked nodes get independent EXECUTE responses without scheduling an activity."""
+        mock_execute_activity = AsyncMock()
+        monkeypatch.setattr(ActionsHub, "execute_activity", mock_execute_activity)
+        disabled_service.node_id_to_payload_map = {"node1#1": _PAYLOAD_STR}
 
-    def test_payload_needs_decoding_with_different_encoding(self):
-        """Test that payload with different encoding type returns True."""
-        payload = {"metadata": {"encoding": "base64"}, "data": "encoded_content"}
+        first = await disabled_service.get_simulation_response("node2#1")
+        second = await disabled_service.get_simulation_response("node3#1")
 
-        assert payload_needs_decoding(payload) is True
+        assert first == second == _EXPECTED_EXECUTE_RESPONSE
+        # Mutating one response must not leak into the others or into later lookups
+        first.execution_response = "mutated"
+        assert second.execution_response is None
+        assert await disabled_service.get_simulation_response("node2#1") == _EXPECTED_EXECUTE_RESPONSE
+        mock_execute_activity.assert_not_called()
 
-    def test_payload_needs_decoding_without_encoding_metadata(self):
-        """Test that payload without encoding metadata returns False."""
-        payload = {"metadata": {"other_field": "value"}, "data": "some_data"}
+    async def test_get_simulation_response_node_found(self, disabled_service, monkeypatch):
+        """Test getting simulation response when node is found."""
+        disabled_service.node_id_to_payload_map = {"node1#1": _PAYLOAD_STR}
 
-        assert payload_needs_decoding(payload) is False
+        monkeypatch.setattr(ActionsHub, "execute_activity", _async_returning(_MOCKED_STR_RESULT))
+        response = await disabled_service.get_simulation_response("node1#1")
 
-    def test_payload_needs_decoding_with_none_encoding(self):
-        """Test that payload with None encoding returns False."""
-        payload = {"metadata": {"encoding": None}, "data": "some_data"}
+        assert response == _EXPECTED_MOCK_STR_RESPONSE
 
-        assert payload_needs_decoding(payload) is False
+    async def test_get_simulation_response_node_not_found(self, disabled_service):
+        """Test getting simulation response when node is not found."""
+        disabled_service.node_id_to_payload_map = {"node1#1": "test_output"}
 
-    def test_payload_needs_decoding_without_metadata(self):
-        """Test that payload without metadata returns False."""
-        payload = {"data": "some_data", "other_field": "value"}
+        response = await disabled_service.get_simulation_response("nonexistent_node")
 
-        assert payload_needs_decoding(payload) is False
+        assert response == _EXPECTED_EXECUTE_RESPONSE
 
-    def test_payload_needs_decoding_with_empty_metadata(self):
-        """Test that payload with empty metadata returns False."""
-        payload = {"metadata": {}, "data": "some_data"}
+    async def test_get_simulation_response_with_dict_output(self, disabled_service, monkeypatch):
+        """Test getting simulation response with dictionary output."""
+        disabled_service.node_id_to_payload_map = {"node1#1": _PAYLOAD_DICT}
 
-        assert payload_needs_decoding(payload) is False
+        monkeypatch.setattr(ActionsHub, "execute_activity", _async_returning(_MOCKED_DICT_RESULT))
+        response = await disabled_service.get_simulation_response("node1#1")
 
-    def test_payload_needs_decoding_non_dict_payload_string(self):
-        """Test that non-dict payload (string) returns False."""
-        payload = "plain_string_payload"
+        assert response == _EXPECTED_MOCK_DICT_RESPONSE
 
-        assert payload_needs_decoding(payload) is False
+    async def test_get_simulation_response_with_list_output(self, disabled_service, monkeypatch):
+        """Test getting simulation response with list output."""
+        disabled_service.node_id_to_payload_map = {"node1#1": _PAYLOAD_LIST}
 
-    def test_payload_needs_decoding_non_dict_payload_list(self):
-        """Test that non-dict payload (list) returns False."""
-        payload = ["item1", "item2"]
+        monkeypatch.setattr(ActionsHub, "execute_activity", _async_returning(_MOCKED_LIST_RESULT))
+        response = await disabled_service.get_simulation_response("node1#1")
 
-        assert payload_needs_decoding(payload) is False
+        assert response == _EXPECTED_MOCK_LIST_RESPONSE
 
-    def test_payload_needs_decoding_non_dict_payload_none(self):
-        """Test that None payload returns False."""
-        payload = None
+    async def test_initialize_simulation_data_success(self, single_custom_output_config, mock_execute_child_workflow):
+        """Test successful initialization of simulation data."""
+        service = WorkflowSimulationService(single_custom_output_config)
 
-        assert payload_needs_decoding(payload) is False
+        # Mock the workflow execution
+        mock_workflow_result = SimpleNamespace(
+            node_id_to_payload_map={"node1#1": _PAYLOAD_STR},
+            s3_key=None,
+        )
 
-    def test_payload_needs_decoding_non_dict_payload_number(self):
-        """Test that numeric payload returns False."""
-        payload = 12345
+        mock_execute_child_workflow.return_value = mock_workflow_result
 
-        assert payload_needs_decoding(payload) is False
+        await service._initialize_simulation_data(workflow_id="test_workflow_id", bucket_name="test-bucket")
 
-    def test_payload_needs_decoding_with_nested_metadata(self):
-        """Test that payload with nested metadata structure works correctly."""
-        payload = {"metadata": {"encoding": "json/plain", "nested": {"field": "value"}}, "data": "encoded_data"}
+        assert len(service.node_id_to_payload_map) == 1
+        assert service.node_id_to_payload_map["node1#1"].output_payload == "test_output"
+        mock_execute_child_workflow.assert_called_once()
 
-        assert payload_needs_decoding(payload) is True
+    async def test_initialize_simulation_data_workflow_failure(
+        self, single_custom_output_config, mock_execute_child_workflow
+    ):
+        """Test initialization when workflow execution fails."""
+        service = WorkflowSimulationService(single_custom_output_config)
 
-    def test_payload_needs_decoding_with_empty_string_encoding(self):
-        """Test that payload with empty string encoding returns False."""
-        payload = {"metadata": {"encoding": ""}, "data": "some_data"}
+        mock_execute_child_workflow.side_effect = RuntimeError("Workflow failed")
 
-        assert payload_needs_decoding(payload) is True
+        with pytest.raises(RuntimeError):
+            await service._initialize_simulation_data(workflow_id="test_workflow_id", bucket_name="test-bucket")
 
-    def test_payload_needs_decoding_real_world_temporal_history(self):
-        """Test with real-world Temporal History encoded payload structure."""
-        payload = {
-            "metadata": {"encoding": "json/plain", "messageType": "ActivityResult"},
-            "data": "eyJyZXN1bHQiOiAidGVzdF9kYXRhIn0=",
-        }
+    async def test_initialize_simulation_data_none_result(self, single_custom_output_config, monkeypatch):
+        """Test initialization when workflow returns None."""
+        service = WorkflowSimulationService(single_custom_output_config)
 
-        assert payload_needs_decoding(payload) is True
+        monkeypatch.setattr(ActionsHub, "execute_child_workflow", _async_returning(None))
 
-    def test_payload_needs_decoding_real_world_custom_output(self):
-        """Test with real-world Custom Output raw payload structure."""
-        payload = {"key": "value", "number": 123, "list": [1, 2, 3]}
+        with pytest.raises(AttributeError):
+            await service._initialize_simulation_data(workflow_id="test_workflow_id", bucket_name="test-bucket")
 
-        assert payload_needs_decoding(payload) is False
+    @pytest.mark.parametrize(
+        "payload, expected",
+        [
+            ({"metadata": {"encoding": "json/plain"}, "data": "some_encoded_data"}, True),
+            ({"metadata": {"encoding": "base64"}, "data": "encoded_content"}, True),
+            ({"metadata": {"other_field": "value"}, "data": "some_data"}, False),
+            ({"metadata": {"encoding": None}, "data": "some_data"}, False),
+            ({"data": "some_data", "other_field": "value"}, False),
+            ({"metadata": {}, "data": "some_data"}, False),
+            ("plain_string_payload", False),
+            (["item1", "item2"], False),
+            (None, False),
+            (12345, False),
+            (_NESTED_META, True),
+            ({"metadata": {"encoding": ""}, "data": "some_data"}, True),
+            (
+                {
+                    "metadata": {"encoding": "json/plain", "messageType": "ActivityResult"},
+                    "data": "eyJyZXN1bHQiOiAidGVzdF9kYXRhIn0=",
+                },
+                True,
+            ),
+            (_DICT_OUTPUT, False),
+        ],
+        ids=[
+            "with_encoding_metadata",
+            "with_different_encoding",
+            "without_encoding_metadata",
+            "with_none_encoding",
+            "without_metadata",
+            "with_empty_metadata",
+            "non_dict_payload_string",
+            "non_dict_payload_list",
+            "non_dict_payload_none",
+            "non_dict_payload_number",
+            "with_nested_metadata",
+            "with_empty_string_encoding",
+            "real_world_temporal_history",
+            "real_world_custom_output",
+        ],
+    )
+    def test_payload_needs_decoding(self, payload, expected):
+        """Test payload_needs_decoding across encoded, raw and non-dict payloads."""
+        assert payload_needs_decoding(payload) is expected
@@ -2,6 +2,9 @@
 Workflow Simulation Service for managing simulation state and responses.
 """
 
+from collections.abc import Callable
+from typing import Any
+
 import structlog
 from zamp_public_workflow_sdk.simulation.models import (
     ExecutionType,
@@ -26,6 +29,15 @@ from zamp_public_workflow_sdk.simulation.models.mocked_result import MockedResul
 
 logger = structlog.get_logger(__name__)
 
+# Builds the strategy handler for each strategy type from its strategy-specific config
+_STRATEGY_BUILDERS: dict[StrategyType, Callable[[Any], BaseStrategy]] = {
+    StrategyType.TEMPORAL_HISTORY: lambda config: TemporalHistoryStrategyHandler(
+        reference_workflow_id=config.reference_workflow_id,
+        reference_workflow_run_id=config.reference_workflow_run_id,
+    ),
+    StrategyType.CUSTOM_OUTPUT: lambda config: CustomOutputStrategyHandler(output_value=config.output_value),
+}
+
 
 class WorkflowSimulationService:
     """
@@ -120,19 +132,17 @@ class WorkflowSimulationService:
             action_name: Optional action name for activity summary
 
         Returns:
-            SimulationResponse with MOCK if node should be mocked (decoded if needed), EXECUTE otherwise
+            SimulationResponse with MOCK if node should be mocked (decoded if needed), EXECUTE otherwise.
         """
-        from zamp_public_workflow_sdk.actions_hub import ActionsHub
-
-        # check if node is in the response map
-        is_response_mocked = node_id in self.node_id_to_payload_map
-        if not is_response_mocked:
+        # Nodes missing from the response map execute normally without scheduling the decode activity;
+        # a single lookup both decides this and fetches the payload
+        node_payload = self.node_id_to_payload_map.get(node_id)
+        if node_payload is None:
             return SimulationResponse(execution_type=ExecutionType.EXECUTE, execution_response=None)
 
-        # If node is in the response map, it should be mocked
-        # node_payload is a NodePayload instance with input_payload and output_payload attributes
-        node_payload = self.node_id_to_payload_map[node_id]
+        from zamp_public_workflow_sdk.actions_hub import ActionsHub
 
+        # node_payload is a NodePayload instance with input_payload and output_payload attributes
         try:
             decoded_result: MockedResultOutput = await ActionsHub.execute_activity(
                 "return_mocked_result",
@@ -171,16 +181,8 @@ class WorkflowSimulationService:
         Returns:
             Instance of the appropriate strategy handler or None if unknown type
         """
-        match node_strategy.strategy.type:
-            case StrategyType.TEMPORAL_HISTORY:
-                temporal_config = node_strategy.strategy.config
-                return TemporalHistoryStrategyHandler(
-                    reference_workflow_id=temporal_config.reference_workflow_id,
-                    reference_workflow_run_id=temporal_config.reference_workflow_run_id,
-                )
-            case StrategyType.CUSTOM_OUTPUT:
-                custom_config = node_strategy.strategy.config
-                return CustomOutputStrategyHandler(output_value=custom_config.output_value)
-            case _:
-                logger.error("Unknown strategy type", strategy_type=node_strategy.strategy.type)
-                raise ValueError(f"Unknown strategy type: {node_strategy.strategy.type}")
+        builder = _STRATEGY_BUILDERS.get(node_strategy.strategy.type)
+        if builder is None:
+            logger.error("Unknown strategy type", strategy_type=node_strategy.strategy.type)
+            raise ValueError(f"Unknown strategy type: {node_strategy.strategy.type}")
+        return builder(node_strategy.strategy.config)
@@ -1,3 +1,7 @@
+import asyncio
+import re
+from collections.abc import Sequence
+
 import temporalio.workflow as workflow
 
 with workflow.unsafe.imports_passed_through():
@@ -7,6 +11,7 @@ with workflow.unsafe.imports_passed_through():
     from zamp_public_workflow_sdk.temporal.workflow_history.models import (
         FetchTemporalWorkflowHistoryInput,
         FetchTemporalWorkflowHistoryOutput,
+        NodePayloadData,
         WorkflowHistory,
     )
     from zamp_public_workflow_sdk.temporal.workflow_history.constants import EventType, EventField
@@ -27,6 +32,32 @@ with workflow.unsafe.imports_passed_through():
 
 logger = structlog.get_logger(__name__)
 
+_EVENT_TYPE_KEY = EventField.EVENT_TYPE.value
+
+# Patch ID gating concurrent child workflow traversal; runs started before it process child workflows one at a time
+CONCURRENT_CHILD_TRAVERSAL_PATCH_ID = "concurrent-child-traversal"
+
+# Event types that mark a node as spawning a child workflow, or as the workflow execution itself
+_CHILD_WORKFLOW_EVENT_TYPES = frozenset(
+    {
+        EventType.START_CHILD_WORKFLOW_EXECUTION_INITIATED.value,
+        EventType.CHILD_WORKFLOW_EXECUTION_STARTED.value,
+    }
+)
+_WORKFLOW_EXECUTION_EVENT_TYPES = frozenset({EventType.WORKFLOW_EXECUTION_STARTED.value})
+
+
+def _node_event_types(node_data: NodePayloadData) -> set[str]:
+    """Collect the distinct event types of a node in one pass over its events."""
+    return {event.get(_EVENT_TYPE_KEY) for event in node_data.node_events}
+
+
+def _compile_substring_matcher(patterns: Sequence[str]) -> re.Pattern[str] | None:
+    """Compile substring patterns into a single alternation regex, or None when there are no patterns."""
+    if not patterns:
+        return None
+    return re.compile("|".join(map(re.escape, patterns)))
+
 
 @ActionsHub.register_workflow_defn(
     "Workflow that generates simulation config by extracting all node IDs from a workflow",
@@ -56,8 +87,13 @@ class SimulationConfigBuilderWorkflow:
         and extracting node IDs for simulation configuration generation.
         """
         self.workflow_histories: dict[str, WorkflowHistory] = {}
-        # List of node IDs to skip
-        self.nodes_to_skip = [
+        # Fetched histories keyed by (workflow_id, run_id), so a child workflow reached twice is fetched once;
+        # each entry also holds the history's parsed nodes data once _get_nodes_data has read it
+        self._history_cache: dict[tuple[str, str], tuple[WorkflowHistory, dict | None]] = {}
+        # In-flight fetches keyed the same way, so concurrent requests for one history share a single fetch
+        self._pending_history_fetches: dict[tuple[str, str], asyncio.Task] = {}
+        # Node ID patterns to skip
+        self.nodes_to_skip: tuple[str, ...] = (
             "generate_llm_model_response",
             "generate_embeddings",
             "generate_with_template",
@@ -65,9 +101,15 @@ class SimulationConfigBuilderWorkflow:
             "fetch_from_responses_api",
             "ChainOfThoughtWorkflow",
             "get_customer_code_from_s3",
-        ]
+        )
         # List of action tools to mock
         self.action_tools_to_mock: list[str] = []
+        self._compile_node_matchers()
+
+    def _compile_node_matchers(self) -> None:
+        """Compile the skip and action-tool patterns into one regex each; call again after changing either list."""
+        self._skip_re = _compile_substring_matcher(self.nodes_to_skip)
+        self._action_tools_re = _compile_substring_matcher(self.action_tools_to_mock)
 
     @ActionsHub.register_workflow_run
     async def execute(self, input: SimulationConfigBuilderInput) -> SimulationConfigBuilderOutput:
@@ -86,9 +128,10 @@ class SimulationConfigBuilderWorkflow:
             Exception: If workflow history cannot be fetched or processed
         """
         if input.execute_actions:
-            self.nodes_to_skip.extend(input.execute_actions)
+            self.nodes_to_skip = (*self.nodes_to_skip, *input.execute_actions)
         if input.action_tools:
             self.action_tools_to_mock = input.action_tools
+        self._compile_node_matchers()
         logger.info(
             "Starting GenerateSimulationConfigWorkflow",
             workflow_id=input.workflow_id,
@@ -123,43 +166,32 @@ class SimulationConfigBuilderWorkflow:
             simulation_config=simulation_config,
         )
 
-    def _is_child_workflow_node(self, node_data) -> bool:
+    def _is_child_workflow_node(self, event_types: set[str]) -> bool:
         """Determine if a node represents a child workflow execution.
 
-        Examines the node's events to identify if it contains child workflow
+        Examines the node's event types to identify if it contains child workflow
         execution events, indicating this node spawns a child workflow.
 
         Args:
-            node_data: Node data containing workflow events
+            event_types: Distinct event types of the node, as returned by _node_event_types
 
         Returns:
             True if the node contains child workflow events, False otherwise
         """
-        for event in node_data.node_events:
-            event_type = event.get(EventField.EVENT_TYPE.value)
-            if event_type in [
-                EventType.START_CHILD_WORKFLOW_EXECUTION_INITIATED.value,
-                EventType.CHILD_WORKFLOW_EXECUTION_STARTED.value,
-            ]:
-                return True
-        return False
-
-    def _is_workflow_execution_node(self, node_data) -> bool:
+        return not _CHILD_WORKFLOW_EVENT_TYPES.isdisjoint(event_types)
+
+    def _is_workflow_execution_node(self, event_types: set[str]) -> bool:
         """Determine if a node represents the workflow execution itself (not an activity or child workflow).
 
         These nodes should be filtered out when extracting node IDs.
 
         Args:
-            node_data: Node data containing workflow events
+            event_types: Distinct event types of the node, as returned by _node_event_types
 
         Returns:
             True if the node represents workflow execution, False otherwise
         """
-        for event in node_data.node_events:
-            event_type = event.get(EventField.EVENT_TYPE.value)
-            if event_type == EventType.WORKFLOW_EXECUTION_STARTED.value:
-                return True
-        return False
+        return not _WORKFLOW_EXECUTION_EVENT_TYPES.isdisjoint(event_types)
 
     async def _process_child_workflow_node(self, node_id: str, workflow_history: WorkflowHistory) -> list[str]:
         """Process a child workflow node and extract its node IDs.
@@ -181,7 +213,7 @@ class SimulationConfigBuilderWorkflow:
         Note:
             Returns an empty list if child workflow processing fails
         """
-        logger.info(
+        logger.debug(
             "Found child workflow node - skipping and traversing",
             node_id=node_id,
         )
@@ -189,7 +221,7 @@ class SimulationConfigBuilderWorkflow:
         try:
             child_workflow_id, child_run_id = workflow_history.get_child_workflow_workflow_id_run_id(node_id=node_id)
 
-            logger.info(
+            logger.debug(
                 "Fetching child workflow history",
                 child_node_id=node_id,
                 child_workflow_id=child_workflow_id,
@@ -203,40 +235,25 @@ class SimulationConfigBuilderWorkflow:
             )
 
             # Get all nodes from child workflow (activities + nested child workflows)
-            nodes_data = child_history.get_nodes_data()
+            nodes_data = self._get_nodes_data(child_history)
 
-            # Check if there are any nested child workflows and if all activities are mockable
-            has_nested_child_workflows = False
-            all_activities_mockable = True
+            can_mock_as_single_node = self._can_mock_as_single_node(nodes_data=nodes_data)
 
-            for child_node_id, child_node_data in nodes_data.items():
-                if self._is_workflow_execution_node(child_node_data):
-                    continue
-                if self._is_child_workflow_node(child_node_data):
-                    has_nested_child_workflows = True
-                else:
-                    if not self._should_include_node(node_id=child_node_id):
-                        all_activities_mockable = False
-
-            # Only return child workflow node_id if:
-            # 1. All activities are mockable
-            # 2. There are NO nested child workflows
-            # 3. The child workflow node_id itself is not in the skip list
-            if all_activities_mockable and not has_nested_child_workflows and len(nodes_data) > 0:
-                if self._should_include_node(node_id=node_id):
-                    logger.info(
-                        "All activities in child workflow would be mocked - mocking entire child workflow",
-                        child_node_id=node_id,
-                        total_nodes=len(nodes_data),
-                    )
-                    return [node_id]  # Return the child workflow node_id itself
+            # Only return child workflow node_id if the child can be mocked as a whole
+            # and the child workflow node_id itself is not in the skip list
+            if can_mock_as_single_node and self._should_include_node(node_id=node_id):
+                logger.info(
+                    "All activities in child workflow would be mocked - mocking entire child workflow",
+                    child_node_id=node_id,
+                    total_nodes=len(nodes_data),
+                )
+                return [node_id]  # Return the child workflow node_id itself
 
             # Either has nested child workflows or some activities not mockable - recursively extract
             logger.info(
                 "Some activities in child workflow would be skipped - mocking individual activities",
                 child_node_id=node_id,
-                has_nested_child_workflows=has_nested_child_workflows,
-                all_activities_mockable=all_activities_mockable,
+                can_mock_as_single_node=can_mock_as_single_node,
             )
             return await self._extract_all_node_ids_recursively(workflow_history=child_history)
 
@@ -248,6 +265,57 @@ class SimulationConfigBuilderWorkflow:
             )
             raise
 
+    def _get_nodes_data(self, workflow_history: WorkflowHistory) -> dict:
+        """Return workflow_history.get_nodes_data(), parsing the history's events only once.
+
+        A child workflow's nodes are read both for the single-node decision and again when
+        its node IDs are extracted, so the parsed result is stored in the history's cache entry.
+        Histories that did not come through _fetch_workflow_history are parsed on every call.
+
+        Args:
+            workflow_history: The workflow history to read nodes from
+
+        Returns:
+            Mapping of node IDs to their node data
+        """
+        key = (workflow_history.workflow_id, workflow_history.run_id)
+        cached_history, nodes_data = self._history_cache.get(key, (None, None))
+        if cached_history is not workflow_history:
+            return workflow_history.get_nodes_data()
+        if nodes_data is None:
+            nodes_data = workflow_history.get_nodes_data()
+            self._history_cache[key] = (workflow_history, nodes_data)
+        return nodes_data
+
+    def _can_mock_as_single_node(self, nodes_data: dict) -> bool:
+        """Determine if a child workflow can be mocked as a single node.
+
+        Args:
+            nodes_data: Nodes data of the child workflow history
+
+        Returns:
+            True if the child has activities, no nested child workflows and no activity in the skip list
+        """
+        if not nodes_data:
+            return False
+
+        should_include_node = self._should_include_node
+        is_workflow_execution_node = self._is_workflow_execution_node
+        is_child_workflow_node = self._is_child_workflow_node
+
+        # Single pass that stops at the first nested child workflow or skipped activity
+        for child_node_id, child_node_data in nodes_data.items():
+            # Event types are collected once per node and shared by both classification checks
+            event_types = _node_event_types(child_node_data)
+            if is_workflow_execution_node(event_types):
+                continue
+            if is_child_workflow_node(event_types):
+                return False
+            if not should_include_node(node_id=child_node_id):
+                return False
+
+        return True
+
     def _should_include_node(self, node_id: str) -> str | None:
         """Determine if a node should be included in the simulation configuration.
 
@@ -266,22 +334,22 @@ class SimulationConfigBuilderWorkflow:
             The node ID if it should be included, None if it should be skipped
         """
         # Check if this node is in the action_tools_to_mock list
-        if any(action_tool in node_id for action_tool in self.action_tools_to_mock):
-            logger.info(
+        if self._action_tools_re is not None and self._action_tools_re.search(node_id):
+            logger.debug(
                 "including node (in action_tools list)",
                 node_id=node_id,
             )
             return node_id
 
         # Check if this node should be skipped based on the skip list
-        if any(skip_pattern in node_id for skip_pattern in self.nodes_to_skip):
-            logger.info(
+        if self._skip_re is not None and self._skip_re.search(node_id):
+            logger.debug(
                 "Skipping node (in skip list)",
                 node_id=node_id,
             )
             return None
         else:
-            logger.info(
+            logger.debug(
                 "Adding activity node",
                 node_id=node_id,
             )
@@ -300,49 +368,98 @@ class SimulationConfigBuilderWorkflow:
         Returns:
             List of all node IDs extracted from the workflow and its children
         """
-        all_node_ids = []
+        # One group per included node, in history order; child workflow groups are filled in after the gather
+        node_id_groups: list[list[str]] = []
+        child_workflow_slots: list[int] = []
+        child_workflow_tasks = []
 
         # Get all nodes from current workflow
-        nodes_data = workflow_history.get_nodes_data()
+        nodes_data = self._get_nodes_data(workflow_history)
+        traverse_children_concurrently = workflow.patched(CONCURRENT_CHILD_TRAVERSAL_PATCH_ID)
 
         logger.info(
             "Processing workflow nodes",
             node_count=len(nodes_data),
         )
 
+        # Bound methods hoisted out of the per-node loop
+        append_group = node_id_groups.append
+        should_include_node = self._should_include_node
+        is_workflow_execution_node = self._is_workflow_execution_node
+        is_child_workflow_node = self._is_child_workflow_node
+
         for node_id, node_data in nodes_data.items():
             # Skip workflow execution nodes (these represent the workflow itself, not activities)
-            if self._is_workflow_execution_node(node_data):
-                logger.info(
+            event_types = _node_event_types(node_data)
+            if is_workflow_execution_node(event_types):
+                logger.debug(
                     "Skipping workflow execution node",
                     node_id=node_id,
                 )
                 continue
 
             # Check if this node is a child workflow
-            is_child_workflow = self._is_child_workflow_node(node_data=node_data)
+            is_child_workflow = is_child_workflow_node(event_types)
 
-            logger.info(
+            logger.debug(
                 "Checking node",
                 node_id=node_id,
                 is_child_workflow=is_child_workflow,
             )
 
             if is_child_workflow:
-                # Process child workflow node
-                child_node_ids = await self._process_child_workflow_node(
-                    node_id=node_id, workflow_history=workflow_history
-                )
-                all_node_ids.extend(child_node_ids)
+                child_node_ids = self._process_child_workflow_node(node_id=node_id, workflow_history=workflow_history)
+                if traverse_children_concurrently:
+                    # Defer child workflow processing so their history fetches run concurrently
+                    child_workflow_slots.append(len(node_id_groups))
+                    append_group([])
+                    child_workflow_tasks.append(child_node_ids)
+                else:
+                    # Runs started before the patch replay child workflows in the original sequential command order
+                    append_group(await child_node_ids)
             else:
                 # Process node if it should be included
-                node_id_to_include = self._should_include_node(node_id=node_id)
+                node_id_to_include = should_include_node(node_id=node_id)
                 if node_id_to_include:
-                    all_node_ids.append(node_id_to_include)
+                    append_group([node_id_to_include])
 
-        return all_node_ids
+        child_node_id_lists = await asyncio.gather(*child_workflow_tasks)
+        for slot, child_node_ids in zip(child_workflow_slots, child_node_id_lists):
+            node_id_groups[slot] = child_node_ids
+
+        # A node can be reached through more than one path; keep the first occurrence only
+        return list(dict.fromkeys(node_id for group in node_id_groups for node_id in group))
 
     async def _fetch_workflow_history(self, workflow_id: str, run_id: str) -> FetchTemporalWorkflowHistoryOutput:
+        """Fetch workflow execution history, reusing earlier or in-flight fetches of the same run.
+
+        Args:
+            workflow_id: The workflow ID to fetch history for
+            run_id: The specific run ID to fetch history for
+
+        Returns:
+            FetchTemporalWorkflowHistoryOutput containing the workflow history
+
+        Raises:
+            Exception: If the workflow history cannot be fetched
+        """
+        key = (workflow_id, run_id)
+        if key in self._history_cache:
+            return self._history_cache[key][0]
+
+        pending = self._pending_history_fetches.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._execute_history_fetch(workflow_id=workflow_id, run_id=run_id))
+            self._pending_history_fetches[key] = pending
+        try:
+            history = await pending
+        finally:
+            self._pending_history_fetches.pop(key, None)
+
+        self._history_cache[key] = (history, None)
+        return history
+
+    async def _execute_history_fetch(self, workflow_id: str, run_id: str) -> FetchTemporalWorkflowHistoryOutput:
         """Fetch workflow execution history from Temporal.
 
         Uses the FetchTemporalWorkflowHistoryWorkflow to retrieve the complete
@@ -358,7 +475,7 @@ class SimulationConfigBuilderWorkflow:
         Raises:
             Exception: If the workflow history cannot be fetched
         """
-        logger.info(
+        logger.debug(
             "Fetching workflow history",
             workflow_id=workflow_id,
             run_id=run_id,
@@ -422,7 +539,8 @@ class SimulationConfigBuilderWorkflow:
                     reference_workflow_run_id=reference_run_id,
                 ),
             ),
-            nodes=mocked_node_ids,
+            # SimulationConfig rejects duplicate nodes, so drop repeats while keeping order
+            nodes=list(dict.fromkeys(mocked_node_ids)),
         )
 
         mock_config = NodeMockConfig(node_strategies=[node_strategy])
@@ -1,3 +1,5 @@
+import asyncio
+
 from temporalio import workflow
 
 with workflow.unsafe.imports_passed_through():
@@ -15,13 +17,18 @@ with workflow.unsafe.imports_passed_through():
         SimulationFetchDataWorkflowOutput,
     )
     from zamp_public_workflow_sdk.simulation.models.simulation_s3 import (
+        SIMULATION_MEMO_ADAPTER,
         SimulationMemo,
         UploadToS3Input,
         UploadToS3Output,
     )
+    from zamp_public_workflow_sdk.simulation.models.simulation_strategy import NodeStrategy
 
     logger = structlog.get_logger(__name__)
 
+# Patch ID gating concurrent strategy execution; runs started before it execute strategies one at a time
+CONCURRENT_STRATEGIES_PATCH_ID = "concurrent-strategies"
+
 
 @ActionsHub.register_workflow_defn(
     "Workflow that fetches simulation data using strategy pattern",
@@ -42,34 +49,16 @@ class SimulationFetchDataWorkflow:
         Returns:
             Mapping of node IDs to their response data and S3 key where data is stored
         """
-        from zamp_public_workflow_sdk.simulation.workflow_simulation_service import (
-            WorkflowSimulationService,
-        )
-
+        node_strategies = input.simulation_config.mock_config.node_strategies
+        if workflow.patched(CONCURRENT_STRATEGIES_PATCH_ID):
+            # Strategies are independent, so run them concurrently and merge in configuration order
+            results = await asyncio.gather(*(self._run_strategy(node_strategy) for node_strategy in node_strategies))
+        else:
+            # Runs started before the patch replay their strategies in the original sequential command order
+            results = [await self._run_strategy(node_strategy) for node_strategy in node_strategies]
         node_id_to_payload_map = {}
-
-        for node_strategy in input.simulation_config.mock_config.node_strategies:
-            strategy = WorkflowSimulationService.get_strategy(node_strategy)
-            if strategy is None:
-                logger.error(
-                    "Strategy not found for node",
-                    node_ids=node_strategy.nodes,
-                    strategy_type=node_strategy.strategy.type,
-                )
-                continue
-            try:
-                result = await strategy.execute(
-                    node_ids=node_strategy.nodes,
-                )
-                node_id_to_payload_map.update(result.node_id_to_payload_map)
-            except Exception as e:
-                logger.error(
-                    "Error processing node with strategy",
-                    node_ids=node_strategy.nodes,
-                    strategy_type=node_strategy.strategy.type,
-                    error=str(e),
-                    error_type=type(e).__name__,
-                )
+        for result in results:
+            node_id_to_payload_map.update(result)
 
         try:
             s3_key = await self._upload_simulation_data_to_s3(
@@ -86,10 +75,47 @@ class SimulationFetchDataWorkflow:
                 bucket_name=input.bucket_name,
                 workflow_id=input.workflow_id,
             )
-            raise Exception(f"Failed to upload simulation data to S3: {str(e)}")
+            raise
 
         return SimulationFetchDataWorkflowOutput(node_id_to_payload_map=node_id_to_payload_map, s3_key=s3_key)
 
+    async def _run_strategy(self, node_strategy: NodeStrategy) -> dict[str, NodePayload]:
+        """
+        Execute a single node strategy, logging and swallowing execution failures.
+
+        Args:
+            node_strategy: Strategy configuration and the nodes it applies to
+
+        Returns:
+            Mapping of node IDs to their payloads, or an empty dict if the strategy failed
+        """
+        from zamp_public_workflow_sdk.simulation.workflow_simulation_service import (
+            WorkflowSimulationService,
+        )
+
+        strategy = WorkflowSimulationService.get_strategy(node_strategy)
+        if strategy is None:
+            logger.error(
+                "Strategy not found for node",
+                node_ids=node_strategy.nodes,
+                strategy_type=node_strategy.strategy.type,
+            )
+            return {}
+        try:
+            result = await strategy.execute(
+                node_ids=node_strategy.nodes,
+            )
+            return result.node_id_to_payload_map
+        except Exception as e:
+            logger.error(
+                "Error processing node with strategy",
+                node_ids=node_strategy.nodes,
+                strategy_type=node_strategy.strategy.type,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            return {}
+
     async def _upload_simulation_data_to_s3(
         self,
         workflow_id: str,
@@ -118,7 +144,8 @@ class SimulationFetchDataWorkflow:
             node_id_to_payload_map=node_id_to_payload_map,
         )
 
-        blob_base64 = base64.b64encode(simulation_memo.model_dump_json().encode()).decode()
+        # Serialize straight to JSON bytes; model_dump_json().encode() would hold an extra full-size str copy
+        blob_base64 = base64.b64encode(SIMULATION_MEMO_ADAPTER.dump_json(simulation_memo)).decode("ascii")
         result: UploadToS3Output = await ActionsHub.execute_activity(
             "upload_to_s3",
             UploadToS3Input(
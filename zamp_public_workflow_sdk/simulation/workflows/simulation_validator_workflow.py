@@ -1,12 +1,14 @@
 from temporalio import workflow
 
 with workflow.unsafe.imports_passed_through():
+    import asyncio
     import structlog
     import json
-    from collections import defaultdict
+    from functools import partial
     from deepdiff import DeepDiff
 
     from zamp_public_workflow_sdk.actions_hub import ActionsHub
+    from zamp_public_workflow_sdk.simulation.helper import collect_nodes_per_workflow
     from zamp_public_workflow_sdk.temporal.workflow_history.models import (
         FetchTemporalWorkflowHistoryInput,
         FetchTemporalWorkflowHistoryOutput,
@@ -22,6 +24,39 @@ logger = structlog.get_logger(__name__)
 
 MAIN_WORKFLOW_IDENTIFIER = "main_workflow"
 
+# Patch ID gating concurrent history fetches and node group comparisons; runs started before it fetch one at a time
+CONCURRENT_VALIDATION_PATCH_ID = "concurrent-validation"
+
+
+def _payloads_equal(expected, actual) -> bool:
+    """
+    Structural equality that stops at the first difference.
+    Like DeepDiff, values of different types are never equal, so 1 and 1.0 do not match.
+    """
+    if expected is actual:
+        return True
+    if type(expected) is not type(actual):
+        return False
+    if isinstance(expected, dict):
+        return expected.keys() == actual.keys() and all(
+            _payloads_equal(value, actual[key]) for key, value in expected.items()
+        )
+    if isinstance(expected, list | tuple):
+        return len(expected) == len(actual) and all(map(_payloads_equal, expected, actual))
+    return expected == actual
+
+
+def _path_prefixes(path: str):
+    """
+    Yield each ancestor path of a dotted path, then the path itself.
+    E.g., "Parent#1.Child#1" yields "Parent#1", then "Parent#1.Child#1", slicing instead of splitting and re-joining.
+    """
+    end = path.find(".")
+    while end != -1:
+        yield path[:end]
+        end = path.find(".", end + 1)
+    yield path
+
 
 @ActionsHub.register_workflow_defn(
     "Workflow that validates simulation by comparing inputs between golden and mocked workflows",
@@ -39,6 +74,12 @@ class SimulationValidatorWorkflow:
         """Initialize workflow with caches for fetched histories."""
         self.simulation_workflow_histories: dict[str, WorkflowHistory] = {}
         self.golden_workflow_histories: dict[str, WorkflowHistory] = {}
+        # In-flight child history fetches keyed by (is_simulation, path), shared by concurrent node groups
+        self._pending_history_fetches: dict[tuple[bool, str], asyncio.Task] = {}
+        # Node IDs each child workflow path must return, so child histories are fetched filtered to them
+        self.workflow_nodes_needed: dict[str, list[str]] = {}
+        # Mocked node outputs come from the mock itself, so they are only diffed when the input asks for it
+        self.compare_mocked_outputs = False
 
     @ActionsHub.register_workflow_run
     async def execute(self, input: SimulationValidatorInput) -> SimulationValidatorOutput:
@@ -67,9 +108,21 @@ class SimulationValidatorWorkflow:
             )
 
         logger.info("Identified mocked nodes", count=len(mocked_nodes))
+        self.compare_mocked_outputs = input.compare_mocked_outputs
+        if not self.compare_mocked_outputs:
+            # Every compared node is mocked, so say once that this run validates inputs only
+            logger.info(
+                "Skipping output comparison for mocked nodes; set compare_mocked_outputs to also validate outputs",
+                mocked_nodes_count=len(mocked_nodes),
+            )
 
-        await self._fetch_and_cache_main_workflows(input)
-        comparisons = await self._compare_all_nodes(mocked_nodes)
+        # Sort once; grouping and child node collection both reuse this order
+        mocked_node_ids = sorted(mocked_nodes)
+        # The history filter matches node ids exactly, so the main histories must keep the top-level
+        # node of each nested id (e.g. "Parent#1"), which is needed to resolve the child workflow run
+        main_workflow_node_ids = sorted({node_id.partition(".")[0] for node_id in mocked_node_ids})
+        await self._fetch_and_cache_main_workflows(input, node_ids=main_workflow_node_ids)
+        comparisons = await self._compare_all_nodes(mocked_node_ids)
         output = self._build_output(comparisons)
 
         logger.info(
@@ -85,43 +138,74 @@ class SimulationValidatorWorkflow:
 
         return output
 
-    async def _fetch_and_cache_main_workflows(self, input: SimulationValidatorInput) -> None:
-        """Fetch and cache main workflow histories for both simulation and golden."""
-        simulation_history = await self._fetch_workflow_history(
+    async def _fetch_and_cache_main_workflows(
+        self, input: SimulationValidatorInput, node_ids: list[str] | None = None
+    ) -> None:
+        """Fetch and cache main workflow histories for both simulation and golden, filtered to node_ids if given."""
+        fetch_simulation_history = partial(
+            self._fetch_workflow_history,
             workflow_id=input.simulation_workflow_id,
             run_id=input.simulation_workflow_run_id,
             description="simulation",
+            node_ids=node_ids,
         )
-        self.simulation_workflow_histories[MAIN_WORKFLOW_IDENTIFIER] = simulation_history
-
-        golden_history = await self._fetch_workflow_history(
+        fetch_golden_history = partial(
+            self._fetch_workflow_history,
             workflow_id=input.golden_workflow_id,
             run_id=input.golden_run_id,
             description="golden",
+            node_ids=node_ids,
         )
+        if workflow.patched(CONCURRENT_VALIDATION_PATCH_ID):
+            # The two histories are independent, so fetch them concurrently
+            simulation_history, golden_history = await asyncio.gather(
+                fetch_simulation_history(), fetch_golden_history()
+            )
+        else:
+            # Runs started before the patch replay the original sequential command order
+            simulation_history = await fetch_simulation_history()
+            golden_history = await fetch_golden_history()
+        self.simulation_workflow_histories[MAIN_WORKFLOW_IDENTIFIER] = simulation_history
         self.golden_workflow_histories[MAIN_WORKFLOW_IDENTIFIER] = golden_history
 
-    async def _compare_all_nodes(self, mocked_nodes: set[str]) -> list[NodeComparison]:
-        """Compare all mocked nodes across main and child workflows."""
-        node_groups = self._group_nodes_by_parent_workflow(list(mocked_nodes))
-        comparisons = []
-
-        for parent_workflow_id, node_ids in node_groups.items():
-            if parent_workflow_id == MAIN_WORKFLOW_IDENTIFIER:
-                comparisons.extend(await self._compare_main_workflow_nodes(node_ids, mocked_nodes))
-            else:
-                comparisons.extend(await self._compare_child_workflow_nodes(parent_workflow_id, node_ids, mocked_nodes))
-
-        return comparisons
+    async def _compare_all_nodes(self, mocked_node_ids: list[str]) -> list[NodeComparison]:
+        """Compare all mocked nodes, given in sorted order, across main and child workflows."""
+        # Every compared node comes from mocked_nodes, so comparisons below are built with is_mocked=True
+        node_groups = self._group_nodes_by_parent_workflow(mocked_node_ids)
+        self.workflow_nodes_needed = collect_nodes_per_workflow(node_ids=mocked_node_ids)
+
+        group_comparison_calls = (
+            self._compare_main_workflow_nodes(node_ids)
+            if parent_workflow_id == MAIN_WORKFLOW_IDENTIFIER
+            else self._compare_child_workflow_nodes(parent_workflow_id, node_ids)
+            for parent_workflow_id, node_ids in node_groups.items()
+        )
+        if workflow.patched(CONCURRENT_VALIDATION_PATCH_ID):
+            # Child workflow groups wait on history fetches, so compare groups concurrently; gather keeps group order
+            group_comparisons = await asyncio.gather(*group_comparison_calls)
+        else:
+            # Runs started before the patch replay the node groups in the original sequential command order
+            group_comparisons = [await group_comparison for group_comparison in group_comparison_calls]
+        # Per-node results are logged at debug in _compare_node; info gets one summary per group
+        for parent_workflow_id, comparisons in zip(node_groups, group_comparisons):
+            logger.info(
+                "Compared node group",
+                parent_workflow_id=parent_workflow_id,
+                compared=len(comparisons),
+                matched=sum(comparison.matched for comparison in comparisons),
+            )
+        return [comparison for comparisons in group_comparisons for comparison in comparisons]
 
-    async def _compare_main_workflow_nodes(self, node_ids: list[str], mocked_nodes: set[str]) -> list[NodeComparison]:
+    async def _compare_main_workflow_nodes(self, node_ids: list[str]) -> list[NodeComparison]:
         """Compare nodes in the main workflow."""
         simulation_nodes = self.simulation_workflow_histories[MAIN_WORKFLOW_IDENTIFIER].get_nodes_data()
         golden_nodes = self.golden_workflow_histories[MAIN_WORKFLOW_IDENTIFIER].get_nodes_data()
 
         return [
-            await self._compare_node(node_id, mocked_nodes, simulation_nodes, golden_nodes)
-            for node_id in sorted(node_ids)
+            await self._compare_node(
+                node_id, is_mocked=True, simulation_nodes=simulation_nodes, golden_nodes=golden_nodes
+            )
+            for node_id in node_ids
         ]
 
     def _build_output(self, comparisons: list[NodeComparison]) -> SimulationValidatorOutput:
@@ -144,7 +228,7 @@ class SimulationValidatorWorkflow:
                     nodes_missing_in_simulation.append(comparison.node_id)
                 elif "not found in golden workflow" in comparison.error:
                     nodes_missing_in_golden.append(comparison.node_id)
-            elif comparison.inputs_match and comparison.outputs_match:
+            elif comparison.matched:
                 matching_count += 1
             else:
                 mismatched_count += 1
@@ -174,14 +258,18 @@ class SimulationValidatorWorkflow:
             mocked_nodes.update(node_strategy.nodes)
         return mocked_nodes
 
-    async def _fetch_workflow_history(self, workflow_id: str, run_id: str, description: str) -> WorkflowHistory:
-        """Fetch workflow history using the FetchTemporalWorkflowHistoryWorkflow."""
+    async def _fetch_workflow_history(
+        self, workflow_id: str, run_id: str, description: str, node_ids: list[str] | None = None
+    ) -> WorkflowHistory:
+        """Fetch workflow history using the FetchTemporalWorkflowHistoryWorkflow, filtered to node_ids if given."""
         logger.info("Fetching workflow history", description=description, workflow_id=workflow_id)
 
         try:
             history = await ActionsHub.execute_child_workflow(
                 "FetchTemporalWorkflowHistoryWorkflow",
-                FetchTemporalWorkflowHistoryInput(workflow_id=workflow_id, run_id=run_id, decode_payloads=True),
+                FetchTemporalWorkflowHistoryInput(
+                    workflow_id=workflow_id, run_id=run_id, node_ids=node_ids, decode_payloads=True
+                ),
                 result_type=FetchTemporalWorkflowHistoryOutput,
             )
             logger.info("Fetched workflow history", description=description, events_count=len(history.events))
@@ -192,7 +280,8 @@ class SimulationValidatorWorkflow:
 
     def _create_error_comparison(self, node_id: str, is_mocked: bool, error: str) -> NodeComparison:
         """Create a NodeInputComparison object for error cases."""
-        return NodeComparison(
+        # Field values are produced here, so skip pydantic validation
+        return NodeComparison.model_construct(
             node_id=node_id,
             is_mocked=is_mocked,
             inputs_match=None,
@@ -206,8 +295,8 @@ class SimulationValidatorWorkflow:
         Returns the dict if serializable, None otherwise.
         """
         try:
-            diff_as_dict = dict(diff)
-            diff_as_dict.pop("type_changes", None)
+            # Build the plain dict in one pass rather than copying the DeepDiff result and popping from the copy
+            diff_as_dict = {key: value for key, value in diff.items() if key != "type_changes"}
             json.dumps(diff_as_dict)
             return diff_as_dict
         except Exception as e:
@@ -220,52 +309,73 @@ class SimulationValidatorWorkflow:
             )
             return None
 
+    def _diff_payloads(self, expected, actual) -> dict | None:
+        """
+        Diff two payloads, returning None when they match.
+        Most compared payloads are equal, so a short-circuiting equality check runs first and
+        DeepDiff only runs to build the detailed difference for payloads that are not.
+        """
+        if type(expected) is not type(actual):
+            # A root type change is all DeepDiff would report, so build its verbose_level=2 entry directly
+            return {
+                "type_changes": {
+                    "root": {
+                        "old_type": type(expected),
+                        "new_type": type(actual),
+                        "old_value": expected,
+                        "new_value": actual,
+                    }
+                }
+            }
+        try:
+            if _payloads_equal(expected, actual):
+                return None
+        except (RecursionError, TypeError) as e:
+            # Payloads nested too deeply for the walker, or whose values cannot be compared with ==, go to DeepDiff
+            logger.debug("Falling back to DeepDiff for payload comparison", error=str(e), error_type=type(e).__name__)
+        return DeepDiff(expected, actual, ignore_order=False, verbose_level=2) or None
+
     async def _compare_node(
         self,
         node_id: str,
-        mocked_nodes: set[str],
+        is_mocked: bool,
         simulation_nodes: dict,
         golden_nodes: dict,
     ) -> NodeComparison:
         """Compare inputs and outputs for a single node between reference and golden workflows."""
-        is_mocked = node_id in mocked_nodes
-
         try:
+            # Compare against None so a present node that happens to be falsy is not reported missing
             simulation_node = simulation_nodes.get(node_id)
-            if not simulation_node:
+            if simulation_node is None:
                 logger.warning("Node not found in simulation workflow", node_id=node_id)
                 return self._create_error_comparison(node_id, is_mocked, "Node not found in simulation workflow")
 
             golden_node = golden_nodes.get(node_id)
-            if not golden_node:
+            if golden_node is None:
                 logger.warning("Node not found in golden workflow", node_id=node_id)
                 return self._create_error_comparison(node_id, is_mocked, "Node not found in golden workflow")
 
-            # Compare inputs and outputs
-            input_diff = DeepDiff(
-                golden_node.input_payload,
-                simulation_node.input_payload,
-                ignore_order=False,
-                verbose_level=2,
-            )
-            output_diff = DeepDiff(
-                golden_node.output_payload,
-                simulation_node.output_payload,
-                ignore_order=False,
-                verbose_level=2,
-            )
-
-            inputs_match = len(input_diff) == 0
-            outputs_match = len(output_diff) == 0
+            # Compare inputs, and outputs unless they are a mocked node's outputs that were not asked for
+            input_diff = self._diff_payloads(golden_node.input_payload, simulation_node.input_payload)
+            inputs_match = input_diff is None
+            if is_mocked and not self.compare_mocked_outputs:
+                output_diff = None
+                outputs_match = None
+            else:
+                output_diff = self._diff_payloads(golden_node.output_payload, simulation_node.output_payload)
+                outputs_match = output_diff is None
 
-            logger.info("Node comparison", node_id=node_id, inputs_match=inputs_match, outputs_match=outputs_match)
+            # The SDK leaves structlog configuration to the host application; under a level-filtering logger
+            # this costs one level check, otherwise it runs the full processor chain like any other log call
+            logger.debug("Node comparison", node_id=node_id, inputs_match=inputs_match, outputs_match=outputs_match)
 
             difference_dict = self._convert_diff_to_dict(input_diff, "input", node_id) if not inputs_match else None
             output_difference_dict = (
-                self._convert_diff_to_dict(output_diff, "output", node_id) if not outputs_match else None
+                self._convert_diff_to_dict(output_diff, "output", node_id) if output_diff is not None else None
             )
 
-            return NodeComparison(
+            # Every field is built by this method from already-typed values, so skip pydantic validation
+            return NodeComparison.model_construct(
                 node_id=node_id,
                 is_mocked=is_mocked,
                 inputs_match=inputs_match,
@@ -286,40 +396,54 @@ class SimulationValidatorWorkflow:
         self,
         parent_workflow_id: str,
         node_ids: list[str],
-        mocked_nodes: set[str],
     ) -> list[NodeComparison]:
         """Compare inputs for nodes that belong to a child workflow."""
-        full_child_path = self._get_workflow_path_from_node(node_ids[0], parent_workflow_id)
+        # Group keys from _group_nodes_by_parent_workflow are already the full path to the child workflow
+        full_child_path = parent_workflow_id
         logger.info("Processing child workflow", full_child_path=full_child_path, node_count=len(node_ids))
 
         try:
-            # Fetch child workflow histories
-            simulation_child_history = await self._fetch_nested_child_workflow_history(
+            fetch_simulation_child_history = partial(
+                self._fetch_nested_child_workflow_history,
                 parent_workflow_history=self.simulation_workflow_histories[MAIN_WORKFLOW_IDENTIFIER],
                 full_child_path=full_child_path,
                 is_simulation=True,
             )
-
-            golden_child_history = await self._fetch_nested_child_workflow_history(
+            fetch_golden_child_history = partial(
+                self._fetch_nested_child_workflow_history,
                 parent_workflow_history=self.golden_workflow_histories[MAIN_WORKFLOW_IDENTIFIER],
                 full_child_path=full_child_path,
                 is_simulation=False,
             )
+            if workflow.patched(CONCURRENT_VALIDATION_PATCH_ID):
+                # Fetch simulation and golden child workflow histories concurrently
+                simulation_child_history, golden_child_history = await asyncio.gather(
+                    fetch_simulation_child_history(), fetch_golden_child_history()
+                )
+            else:
+                # Runs started before the patch replay the original sequential command order
+                simulation_child_history = await fetch_simulation_child_history()
+                golden_child_history = await fetch_golden_child_history()
 
             # Extract and compare nodes
             simulation_child_nodes = simulation_child_history.get_nodes_data()
             golden_child_nodes = golden_child_history.get_nodes_data()
 
             return [
-                await self._compare_node(node_id, mocked_nodes, simulation_child_nodes, golden_child_nodes)
-                for node_id in sorted(node_ids)
+                await self._compare_node(
+                    node_id,
+                    is_mocked=True,
+                    simulation_nodes=simulation_child_nodes,
+                    golden_nodes=golden_child_nodes,
+                )
+                for node_id in node_ids
             ]
 
         except Exception as e:
             logger.error("Error comparing child workflow nodes", parent_workflow_id=parent_workflow_id, error=str(e))
             return [
                 self._create_error_comparison(
-                    node_id, node_id in mocked_nodes, f"Failed to fetch child workflow history: {str(e)}"
+                    node_id, is_mocked=True, error=f"Failed to fetch child workflow history: {str(e)}"
                 )
                 for node_id in node_ids
             ]
@@ -335,61 +459,75 @@ class SimulationValidatorWorkflow:
         E.g., "Parent#1.Child#1" fetches Parent#1, then Child#1 from Parent#1.
         """
         workflow_histories = self.simulation_workflow_histories if is_simulation else self.golden_workflow_histories
-        path_parts = full_child_path.split(".")
         current_history = parent_workflow_history
+        share_in_flight_fetches = workflow.patched(CONCURRENT_VALIDATION_PATCH_ID)
 
-        for depth_level in range(len(path_parts)):
-            current_path = ".".join(path_parts[: depth_level + 1])
-
+        for current_path in _path_prefixes(full_child_path):
             # Check cache
             if current_path in workflow_histories:
                 current_history = workflow_histories[current_path]
                 continue
 
-            # Get workflow IDs and fetch history
+            if not share_in_flight_fetches:
+                # Runs started before the patch compared groups one at a time and fetched every uncached path directly
+                current_history = await self._fetch_child_workflow_history(current_history, current_path, is_simulation)
+                workflow_histories[current_path] = current_history
+                continue
+
+            # Sibling groups share ancestor paths; join an in-flight fetch of the same path instead of repeating it
+            pending_key = (is_simulation, current_path)
+            pending = self._pending_history_fetches.get(pending_key)
+            if pending is None:
+                pending = asyncio.ensure_future(
+                    self._fetch_child_workflow_history(current_history, current_path, is_simulation)
+                )
+                self._pending_history_fetches[pending_key] = pending
             try:
-                workflow_id, run_id = current_history.get_child_workflow_workflow_id_run_id(current_path)
-            except ValueError as e:
-                raise Exception(
-                    f"Failed to get workflow_id and run_id for child workflow at path={current_path}. "
-                    f"Child workflow execution may not have started or node_id may be invalid. "
-                    f"Original error: {str(e)}"
-                ) from e
-
-            current_history = await self._fetch_workflow_history(
-                workflow_id=workflow_id,
-                run_id=run_id,
-                description=f"{'simulation' if is_simulation else 'golden'} child {current_path}",
-            )
+                current_history = await pending
+            finally:
+                self._pending_history_fetches.pop(pending_key, None)
 
             workflow_histories[current_path] = current_history
 
         return current_history
 
+    async def _fetch_child_workflow_history(
+        self,
+        parent_workflow_history: WorkflowHistory,
+        child_path: str,
+        is_simulation: bool,
+    ) -> WorkflowHistory:
+        """Resolve the child workflow at child_path from its parent history and fetch its history."""
+        try:
+            workflow_id, run_id = parent_workflow_history.get_child_workflow_workflow_id_run_id(child_path)
+        except ValueError as e:
+            raise Exception(
+                f"Failed to get workflow_id and run_id for child workflow at path={child_path}. "
+                f"Child workflow execution may not have started or node_id may be invalid. "
+                f"Original error: {str(e)}"
+            ) from e
+
+        return await self._fetch_workflow_history(
+            workflow_id=workflow_id,
+            run_id=run_id,
+            description=f"{'simulation' if is_simulation else 'golden'} child {child_path}",
+            # Only the mocked nodes and nested child workflows under this path are compared
+            node_ids=self.workflow_nodes_needed.get(child_path),
+        )
+
     def _group_nodes_by_parent_workflow(self, node_ids: list[str]) -> dict[str, list[str]]:
         """
-        Group node IDs by their immediate parent workflow.
+        Group node IDs by their immediate parent workflow, keeping the input order within and across groups.
+        execute passes the mocked node IDs already sorted, so every group lists its nodes in sorted order.
 
         Examples:
             'activity#1' -> MAIN_WORKFLOW_IDENTIFIER
             'Child#1.activity#1' -> 'Child#1'
             'Parent#1.Child#1.activity#1' -> 'Parent#1.Child#1'
         """
-        node_groups = defaultdict(list)
+        node_groups: dict[str, list[str]] = {}
         for node_id in node_ids:
-            parts = node_id.split(".")
-            parent = MAIN_WORKFLOW_IDENTIFIER if len(parts) == 1 else ".".join(parts[:-1])
-            node_groups[parent].append(node_id)
-        return dict(node_groups)
-
-    def _get_workflow_path_from_node(self, node_id: str, child_workflow_id: str) -> str:
-        """
-        Extract the full path to the child workflow from a node ID.
-
-        Example: "Parent#1.Child#1.activity#1" with child_workflow_id "Child#1" -> "Parent#1.Child#1"
-        """
-        parts = node_id.split(".")
-        for i, part in enumerate(parts):
-            if child_workflow_id in part:
-                return ".".join(parts[: i + 1])
-        return ".".join(parts[:-1])
+            # Everything before the last "." is the parent path; rpartition avoids splitting and re-joining
+            parent, _, _ = node_id.rpartition(".")
+            node_groups.setdefault(parent or MAIN_WORKFLOW_IDENTIFIER, []).append(node_id)
+        return node_groups